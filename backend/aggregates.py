@@ -0,0 +1,205 @@
+"""Running aggregates for dashboard endpoints.
+
+Each store is rebuilt from its submission table on startup and then
+updated in O(1) per committed form, so reads never scan the collected rows.
+The counts are tagged with the table's data version, which
+``TableTarget.write_batch`` and ``import_form_csvs`` bump in the same
+transaction as their rows. A committed batch is added only when the counts
+were current up to the previous version; any other move of the version (an
+import, a re-seed, a batch written by another worker) is picked up by
+rebuilding from the table on the next read.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import anyio
+from sqlalchemy import func
+from sqlalchemy.orm import Session, sessionmaker
+
+from data_versions import CachedDataVersion, read_data_version
+from models import CrowdsourcingReport, MonitoringResponse
+
+INTENT_TO_LEAVE = "Планирую уехать"
+
+
+class TableAggregate(ABC):
+    """Counts over one table, kept at the table's data version.
+
+    Subclasses read the counts in ``_count`` and install them in
+    ``_replace``; ``_add`` updates them for one row (under ``_lock``).
+    """
+
+    def __init__(self, session_factory: sessionmaker, table_version: CachedDataVersion) -> None:
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._session_factory = session_factory
+        self._table_version = table_version
+        # -1: таблицу ещё не читали; _seen — самая новая
+        # из известных версий таблицы
+        self.version = -1
+        self.updated_at: Optional[float] = None
+        self._seen = 0
+
+    @abstractmethod
+    def _count(self, db: Session) -> object:
+        """Read the counts from the table."""
+
+    @abstractmethod
+    def _replace(self, counts: object) -> None:
+        """Install counts returned by ``_count``."""
+
+    @abstractmethod
+    def _add(self, row: Mapping[str, object]) -> None:
+        """Count one committed row."""
+
+    def rebuild(self) -> None:
+        """Re-read the counts and their version from one database snapshot."""
+        with self._session_factory() as db:
+            connection = db.connection()
+            if connection.dialect.name == "sqlite":
+                # pysqlite не открывает транзакцию для SELECT:
+                # без BEGIN версия и счётчики читались бы
+                # из разных снимков
+                connection.exec_driver_sql("BEGIN")
+            version, updated_at = read_data_version(db, self._table_version.name)
+            counts = self._count(db)
+        with self._lock:
+            # пока шло чтение, добавили более новый батч:
+            # снимок устарел
+            if version < self.version:
+                return
+            self._replace(counts)
+            self.version = version
+            self.updated_at = updated_at
+
+    def apply(self, rows: Sequence[Mapping[str, object]], version: int, updated_at: float) -> None:
+        """Add a committed batch whose transaction moved the table to ``version``."""
+        with self._lock:
+            if version != self.version + 1:
+                # таблицу менял кто-то ещё (или батч уже учтён
+                # пересборкой) — пересоберём при следующем чтении
+                self._seen = max(self._seen, version)
+                return
+            for row in rows:
+                self._add(row)
+            self.version = version
+            self.updated_at = updated_at
+
+    async def data_version(self) -> Tuple[str, Optional[float]]:
+        """Version of the counts, rebuilt first if the table has moved past them."""
+        latest, _ = await self._table_version.get()
+        if max(latest, self._seen) > self.version:
+            await anyio.to_thread.run_sync(self._catch_up, latest)
+        with self._lock:
+            return str(self.version), self.updated_at
+
+    def _catch_up(self, latest: int) -> None:
+        with self._rebuild_lock:
+            if max(latest, self._seen) > self.version:
+                self.rebuild()
+
+
+class MonitoringAggregate(TableAggregate):
+    def __init__(self, session_factory: sessionmaker, table_version: CachedDataVersion) -> None:
+        super().__init__(session_factory, table_version)
+        self.score_counts: Counter = Counter()
+        self.intent_counts: Counter = Counter()
+        self.score_sum = 0
+        self.total = 0
+
+    def _count(self, db: Session) -> Tuple[Counter, Counter]:
+        score = MonitoringResponse.life_quality_score
+        intent = MonitoringResponse.intent_to_leave
+        rows = db.query(score, intent, func.count(MonitoringResponse.id)).group_by(score, intent).all()
+        score_counts: Counter = Counter()
+        intent_counts: Counter = Counter()
+        for value, intent_value, count in rows:
+            score_counts[value] += count
+            intent_counts[intent_value] += count
+        return score_counts, intent_counts
+
+    def _replace(self, counts: Tuple[Counter, Counter]) -> None:
+        self.score_counts, self.intent_counts = counts
+        self.score_sum = sum(value * count for value, count in self.score_counts.items())
+        self.total = sum(self.score_counts.values())
+
+    def _add(self, row: Mapping[str, object]) -> None:
+        score = int(row["life_quality_score"])
+        self.score_counts[score] += 1
+        self.intent_counts[row["intent_to_leave"]] += 1
+        self.score_sum += score
+        self.total += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            total = self.total
+            score_sum = self.score_sum
+            leaving = self.intent_counts[INTENT_TO_LEAVE]
+            distribution = sorted(self.score_counts.items())
+        return {
+            "average_score": round(score_sum / total, 1) if total else 0.0,
+            "intent_share": round(leaving / total * 100, 1) if total else 0.0,
+            "ratings_distribution": [
+                {"life_quality_score": value, "count": count} for value, count in distribution
+            ],
+        }
+
+
+def ranked(counts: Counter, key: str) -> List[Dict[str, object]]:
+    items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return [{key: value, "count": count} for value, count in items if count]
+
+
+class CrowdsourcingAggregate(TableAggregate):
+    """Counters keyed by (district, issue_type, priority) plus their marginals."""
+
+    def __init__(self, session_factory: sessionmaker, table_version: CachedDataVersion) -> None:
+        super().__init__(session_factory, table_version)
+        self.cells: Counter = Counter()
+        self.by_issue: Counter = Counter()
+        self.by_district: Counter = Counter()
+
+    def _count(self, db: Session) -> Counter:
+        columns = (CrowdsourcingReport.district, CrowdsourcingReport.issue_type, CrowdsourcingReport.priority)
+        rows = db.query(*columns, func.count(CrowdsourcingReport.id)).group_by(*columns).all()
+        cells: Counter = Counter()
+        for district, issue_type, priority, count in rows:
+            cells[(district, issue_type, priority)] = count
+        return cells
+
+    def _replace(self, cells: Counter) -> None:
+        self.cells = cells
+        self.by_issue = Counter()
+        self.by_district = Counter()
+        for (district, issue_type, _), count in cells.items():
+            self.by_issue[issue_type] += count
+            self.by_district[district] += count
+
+    def _add(self, row: Mapping[str, object]) -> None:
+        key: Tuple[object, object, object] = (row["district"], row["issue_type"], row["priority"])
+        self.cells[key] += 1
+        self.by_issue[key[1]] += 1
+        self.by_district[key[0]] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            by_issue = self.by_issue.copy()
+            by_district = self.by_district.copy()
+        return {
+            "issues_by_type": ranked(by_issue, "issue_type"),
+            "issues_by_district": ranked(by_district, "district"),
+        }
+
+    def crosstab(self) -> Dict[str, object]:
+        with self._lock:
+            cells = self.cells.copy()
+        return {
+            "total": sum(cells.values()),
+            "cells": [
+                {"district": district, "issue_type": issue_type, "priority": priority, "count": count}
+                for (district, issue_type, priority), count in sorted(cells.items())
+            ],
+        }
@@ -1,16 +1,20 @@
+import sys
 from pathlib import Path
 
 import matplotlib.pyplot as plt
-import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 IMG_DIR = BASE_DIR / "static" / "img"
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def run() -> None:
-    df = pd.read_csv(DATA_DIR / "crowdsourcing_roads_responses.csv")
+    df = load_dataset(DATA_DIR / "crowdsourcing_roads_responses.csv")
     issue_counts = df["issue_type"].value_counts().reset_index()
     issue_counts.columns = ["issue_type", "count"]
 
@@ -1,14 +1,21 @@
+import hashlib
+import json
 import pickle
+import sys
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import mean_squared_error, r2_score
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+from inequality_report import ARTIFACT_FORMAT, ARTIFACT_FORMAT_VERSION  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 IMG_DIR = BASE_DIR / "static" / "img"
 IMG_DIR.mkdir(parents=True, exist_ok=True)
@@ -16,7 +23,8 @@ IMG_DIR.mkdir(parents=True, exist_ok=True)
 
 def run() -> None:
     # 1. Load the data
-    df = pd.read_csv(DATA_DIR / "digital_inequality_regions.csv")
+    data_path = DATA_DIR / "digital_inequality_regions.csv"
+    df = load_dataset(data_path)
     
     # 2. Split into features X and target y
     feature_columns = ["gdp_per_capita_k", "urban_share", "education_index", "elderly_share", 
@@ -57,37 +65,41 @@ def run() -> None:
         print(f"- {feature}: {coef:.4f}")
     print(f"Intercept: {model.intercept_:.4f}")
     
-    # 7. Create predict_scenario function
-    def predict_scenario(gdp_per_capita_k, urban_share, education_index, elderly_share,
-                         unemployment_rate, internet_penetration, infrastructure_exp_per_cap):
-        """Function to predict digital inequality index based on feature values"""
-        scenario_data = np.array([[gdp_per_capita_k, urban_share, education_index, elderly_share,
-                                   unemployment_rate, internet_penetration, infrastructure_exp_per_cap]])
-        prediction = model.predict(scenario_data)
-        return prediction[0]
+    # 7. Create predict_scenarios function
+    def predict_scenarios(scenarios):
+        """Predict the digital inequality index for many scenarios in one call.
+
+        ``scenarios`` is a list of dicts keyed by feature name (or a 2-D array
+        in ``feature_columns`` order); returns one prediction per scenario.
+        """
+        if len(scenarios) and isinstance(scenarios[0], dict):
+            scenarios = [[scenario[feature] for feature in feature_columns] for scenario in scenarios]
+        scenario_data = np.asarray(scenarios, dtype=np.float64)
+        return scenario_data @ model.coef_ + model.intercept_
     
     # 8. Run scenarios
-    # Optimistic scenario
-    optimistic_pred = predict_scenario(
-        gdp_per_capita_k=1000,      # high income
-        urban_share=0.9,            # high urbanization
-        education_index=0.9,        # high education
-        elderly_share=0.15,         # low elderly share
-        unemployment_rate=0.05,     # low unemployment
-        internet_penetration=0.95,  # high internet penetration
-        infrastructure_exp_per_cap=70  # high infrastructure spending
-    )
-    
-    # Pessimistic scenario
-    pessimistic_pred = predict_scenario(
-        gdp_per_capita_k=500,       # low income
-        urban_share=0.6,            # medium urbanization
-        education_index=0.5,        # low education
-        elderly_share=0.35,         # high elderly share
-        unemployment_rate=0.12,     # high unemployment
-        internet_penetration=0.5,   # low internet penetration
-        infrastructure_exp_per_cap=30  # low infrastructure spending
-    )
+    optimistic_pred, pessimistic_pred = predict_scenarios([
+        # Optimistic scenario
+        dict(
+            gdp_per_capita_k=1000,      # high income
+            urban_share=0.9,            # high urbanization
+            education_index=0.9,        # high education
+            elderly_share=0.15,         # low elderly share
+            unemployment_rate=0.05,     # low unemployment
+            internet_penetration=0.95,  # high internet penetration
+            infrastructure_exp_per_cap=70  # high infrastructure spending
+        ),
+        # Pessimistic scenario
+        dict(
+            gdp_per_capita_k=500,       # low income
+            urban_share=0.6,            # medium urbanization
+            education_index=0.5,        # low education
+            elderly_share=0.35,         # high elderly share
+            unemployment_rate=0.12,     # high unemployment
+            internet_penetration=0.5,   # low internet penetration
+            infrastructure_exp_per_cap=30  # low infrastructure spending
+        ),
+    ])
     
     print(f"Optimistic scenario prediction: {optimistic_pred:.4f}")
     print(f"Pessimistic scenario prediction: {pessimistic_pred:.4f}")
@@ -98,6 +110,28 @@ def run() -> None:
         pickle.dump(model, f)
     print(f"Model saved to {model_path}")
     
+    # 9b. Save the compact artifact the backend loads without sklearn
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "feature_names": feature_columns,
+        "coefficients": model.coef_.tolist(),
+        "intercept": float(model.intercept_),
+        "metrics": {
+            "r2": float(r2),
+            "rmse": float(rmse),
+            "cv_r2_mean": float(cv_r2_scores.mean()),
+            "cv_rmse_mean": float(cv_rmse_scores.mean()),
+        },
+        "training": {
+            "rows": len(df),
+            "data_sha256": hashlib.sha256(data_path.read_bytes()).hexdigest(),
+        },
+    }
+    artifact_path = BASE_DIR / "digital_inequality_model.json"
+    artifact_path.write_text(json.dumps(artifact, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Model artifact saved to {artifact_path}")
+    
     # 10. Generate charts
     # Chart 1: Bar chart of absolute coefficient values (feature importance)
     plt.figure(figsize=(10, 6))
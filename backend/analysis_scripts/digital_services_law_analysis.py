@@ -1,13 +1,16 @@
+import sys
 from pathlib import Path
 
-import pandas as pd
-
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 
 
 def run() -> None:
-    df = pd.read_csv(DATA_DIR / "digital_services_law_summary.csv")
+    df = load_dataset(DATA_DIR / "digital_services_law_summary.csv")
     leader = df.sort_values("service_scope_index", ascending=False).iloc[0]
     print("Сравнительно-правовой анализ цифровых услуг")
     for _, row in df.iterrows():
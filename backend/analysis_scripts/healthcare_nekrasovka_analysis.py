@@ -1,9 +1,12 @@
 import math
+import sys
 from pathlib import Path
 
-import pandas as pd
-
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 
 
@@ -18,8 +21,8 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
 
 
 def run() -> None:
-    facilities = pd.read_csv(DATA_DIR / "healthcare_nekrasovka_points.csv")
-    districts = pd.read_csv(DATA_DIR / "healthcare_nekrasovka_population.csv")
+    facilities = load_dataset(DATA_DIR / "healthcare_nekrasovka_points.csv")
+    districts = load_dataset(DATA_DIR / "healthcare_nekrasovka_population.csv")
     total_pop = districts["population"].sum()
     uncovered = 0
     for _, district in districts.iterrows():
@@ -1,16 +1,21 @@
+import sys
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 IMG_DIR = BASE_DIR / "static" / "img"
 IMG_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def run() -> None:
-    df = pd.read_csv(DATA_DIR / "kpi_suzdal_monthly.csv")
+    df = load_dataset(DATA_DIR / "kpi_suzdal_monthly.csv")
     df["month_label"] = pd.to_datetime(df["month"]).dt.strftime("%b")
 
     fig, ax1 = plt.subplots(figsize=(9, 4))
@@ -1,13 +1,16 @@
+import sys
 from pathlib import Path
 
-import pandas as pd
-
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from columnar import load_dataset  # noqa: E402
+
 DATA_DIR = BASE_DIR / "data"
 
 
 def run() -> None:
-    df = pd.read_csv(DATA_DIR / "nn_gorod_idey_ideas.csv")
+    df = load_dataset(DATA_DIR / "nn_gorod_idey_ideas.csv")
     counts = df["category"].value_counts()
     top_category = counts.idxmax()
     print(f"Всего идей: {len(df)}")
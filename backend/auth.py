@@ -1,20 +1,40 @@
+import math
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from config import ACCESS_TOKEN_EXPIRE_DELTA, ALGORITHM, SECRET_KEY
-from database import get_db
+from config import (
+    ACCESS_TOKEN_EXPIRE_DELTA,
+    ALGORITHM,
+    AUTH_CACHE_MAX_ENTRIES,
+    AUTH_CACHE_TTL,
+    LOGIN_FAILURE_WINDOW,
+    LOGIN_MAX_FAILURES_PER_IP,
+    LOGIN_MAX_FAILURES_PER_USER,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_THREADS,
+    SECRET_KEY,
+)
+from database import ReadSessionLocal, get_db
+from login_throttle import LoginThrottle
+from metrics import PHASE_SECONDS
 from models import User
+from password_hasher import HasherBusy, PasswordHasher
 from schemas import LoginRequest, TokenResponse, UserOut
+from token_cache import TokenCache, token_digest
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 security = HTTPBearer(auto_error=False)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_cache = TokenCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL)
+password_hasher = PasswordHasher(PASSWORD_HASH_THREADS, PASSWORD_HASH_QUEUE)
+login_throttle = LoginThrottle(LOGIN_MAX_FAILURES_PER_USER, LOGIN_MAX_FAILURES_PER_IP, LOGIN_FAILURE_WINDOW)
 
 
 def get_password_hash(password: str) -> str:
@@ -22,16 +42,27 @@ def get_password_hash(password: str) -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with PHASE_SECONDS.time("verify_password"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.username == username).first()
+def check_credentials(username: str, password: str) -> Optional[User]:
+    with ReadSessionLocal() as db:
+        user = db.query(User).filter(User.username == username).first()
     if not user or not verify_password(password, user.hashed_password):
         return None
     return user
 
 
+async def authenticate_user(username: str, password: str) -> Optional[User]:
+    """Check the credentials on the hashing pool; raises ``HasherBusy`` when it is full.
+
+    The user lookup runs there too, so a refused login costs no database work
+    and logins never hold connections other requests are waiting for.
+    """
+    return await password_hasher.run(check_credentials, username, password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or ACCESS_TOKEN_EXPIRE_DELTA)
@@ -40,15 +71,30 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+def revoke_user_tokens(db_session: Session, user: User) -> None:
+    """Invalidate every token issued to ``user`` (logout, password change, demotion); the caller commits.
+
+    Cached tokens are dropped only after the commit: evicted earlier, a
+    concurrent request would re-read the old ``token_version`` and cache
+    the revoked token again.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    username = user.username
+    event.listen(db_session, "after_commit", lambda session: token_cache.revoke_user(username), once=True)
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials | None = Depends(security)) -> UserOut:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
     token = credentials.credentials
+    digest = token_digest(token)
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return cached.user
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with PHASE_SECONDS.time("jwt_decode"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
@@ -56,21 +102,78 @@ def get_current_user(
     if username is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    with ReadSessionLocal() as db:
+        user = db.query(User).filter(User.username == username).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        if payload.get("ver", 0) != user.token_version:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+        user_out = UserOut.model_validate(user)
+    token_cache.put(digest, payload, user_out)
+    return user_out
+
+
+def is_admin_token(token: str) -> bool:
+    """True for a valid, unrevoked token of an admin; gates diagnostics outside this router."""
+    try:
+        user = get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    except HTTPException:
+        return False
+    return user.is_admin
+
+
+def too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
-    user = authenticate_user(db, data.username, data.password)
+async def login(data: LoginRequest, request: Request) -> TokenResponse:
+    client_ip = request.client.host if request.client else "unknown"
+    # попытка резервируется до проверки пароля и остаётся неудачей, если пароль неверный
+    retry_after = login_throttle.acquire(data.username, client_ip)
+    if retry_after > 0:
+        raise too_many_requests("Слишком много попыток входа, повторите позже", retry_after)
+    try:
+        user = await authenticate_user(data.username, data.password)
+    except BaseException as exc:
+        login_throttle.release(data.username, client_ip)
+        if isinstance(exc, HasherBusy):
+            raise too_many_requests("Сервис перегружен, повторите позже", 1) from exc
+        raise
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверный логин или пароль")
-    token = create_access_token({"sub": user.username})
+    login_throttle.record_success(data.username, client_ip)
+    token = create_access_token({"sub": user.username, "ver": user.token_version})
     return TokenResponse(access_token=token, user=UserOut.model_validate(user))
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(current_user: UserOut = Depends(get_current_user), db: Session = Depends(get_db)) -> None:
+    """Revoke all tokens of the current user"""
+    user = db.get(User, current_user.id)
+    if user is not None:
+        revoke_user_tokens(db, user)
+        db.commit()
+
+
 @router.get("/me", response_model=UserOut)
-def read_current_user(current_user: User = Depends(get_current_user)) -> UserOut:
-    return UserOut.model_validate(current_user)
+def read_current_user(current_user: UserOut = Depends(get_current_user)) -> UserOut:
+    return current_user
+
+
+@router.get("/cache")
+def token_cache_stats(current_user: UserOut = Depends(get_current_user)) -> Dict[str, Any]:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+    return token_cache.stats()
+
+
+@router.get("/login-stats")
+def login_stats(current_user: UserOut = Depends(get_current_user)) -> Dict[str, Any]:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+    return {"hasher": password_hasher.stats(), "throttle": login_throttle.stats()}
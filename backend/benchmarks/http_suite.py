@@ -0,0 +1,397 @@
+"""End-to-end HTTP benchmark of every API route, compared against a baseline.
+
+Builds a scratch copy of ``data/`` with the form datasets scaled to
+``--rows`` rows (``synthetic_data``), seeds a fresh SQLite database from
+it, and serves the application plus the auth router either in-process
+(ASGI transport, no sockets) or under uvicorn on a local port. Clients then
+run a weighted mix of reads and form posts for ``--seconds``; throughput,
+latency percentiles and error counts are recorded per route.
+
+With ``--baseline`` the run is compared route by route: a p95 more than
+``--threshold`` higher, or throughput more than ``--threshold`` lower, is a
+regression and the exit status is 1. Differences under ``--min-delta-ms``
+are ignored as noise. ``--save-baseline`` writes the run as the new
+baseline. Needs no network access.
+
+    python benchmarks/http_suite.py --baseline benchmarks/http_baseline.json
+    python benchmarks/http_suite.py --mode uvicorn --rows 1000000 --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+DEFAULT_BASELINE = Path(__file__).parent / "http_baseline.json"
+SCALED_DATASETS = ("monitoring_kostroma", "crowdsourcing_roads", "nn_gorod_idey")
+ADMIN = ("admin", "admin123")
+LOGOUT_PASSWORD = "bench-logout"
+
+Headers = Dict[str, str]
+
+
+@dataclass(frozen=True)
+class Route:
+    """One request of the mix.
+
+    ``prepare(client, worker)`` runs before the timed request and returns its
+    headers, or None to skip the request (e.g. when the login it needs was
+    refused).
+    """
+
+    name: str
+    method: str
+    path: str
+    weight: float
+    body: Optional[Callable[[random.Random], Any]] = None
+    auth: bool = False
+    prepare: Optional[Callable[[Any, int], Awaitable[Optional[Headers]]]] = None
+
+
+def monitoring_form(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "age": rng.randint(18, 72),
+        "gender": rng.choice(["Женщина", "Мужчина"]),
+        "employment_type": rng.choice(["Госсектор", "Бизнес", "ИТ"]),
+        "life_quality_score": rng.randint(1, 10),
+        "intent_to_leave": rng.choice(["Планирую уехать", "Останусь"]),
+        "comment": "Нагрузочный тест",
+    }
+
+
+def crowdsourcing_form(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "district": rng.choice(["Центральный", "Заволжский", "Северный"]),
+        "issue_type": rng.choice(["Ямы во дворах", "Снег и наледь"]),
+        "description": "Нагрузочный тест",
+        "priority": rng.choice(["Низкий", "Средний", "Высокий"]),
+    }
+
+
+def nn_idea_form(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "category": rng.choice(["Транспорт", "Культура"]),
+        "title": f"Идея {rng.randint(1, 10**6)}",
+        "description": "Нагрузочный тест",
+        "expected_impact": "Сокращение времени услуги на 20%",
+    }
+
+
+def kpi_feedback_form(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "service_name": "МФЦ",
+        "month": "2024-06",
+        "wait_time_minutes": rng.randint(0, 60),
+        "satisfaction_score": rng.randint(1, 10),
+    }
+
+
+def predict_body(features: int) -> Callable[[random.Random], Any]:
+    return lambda rng: {"rows": [[rng.uniform(0, 100) for _ in range(features)] for _ in range(20)]}
+
+
+def logout_user(worker: int) -> str:
+    return f"bench-logout-{worker}"
+
+
+async def fresh_logout_token(client, worker: int) -> Optional[Headers]:
+    # выход отзывает все токены пользователя, поэтому у каждого клиента свой пользователь и свежий вход
+    response = await client.post("/api/auth/login", json={"username": logout_user(worker), "password": LOGOUT_PASSWORD})
+    if response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def build_routes(task_slug: str, features: int) -> List[Route]:
+    return [
+        Route("GET /api/tasks", "GET", "/api/tasks", 10),
+        Route("GET /api/tasks?limit", "GET", "/api/tasks?limit=5", 4),
+        Route("GET /api/tasks/search", "GET", "/api/tasks/search?q=цифровое неравенство", 5),
+        Route("GET /api/tasks/{slug}", "GET", f"/api/tasks/{task_slug}", 10),
+        Route("POST /api/forms/monitoring-kostroma", "POST", "/api/forms/monitoring-kostroma", 3, monitoring_form),
+        Route("POST /api/forms/crowdsourcing-roads", "POST", "/api/forms/crowdsourcing-roads", 3, crowdsourcing_form),
+        Route("POST /api/forms/nn-gorod-idey", "POST", "/api/forms/nn-gorod-idey", 2, nn_idea_form),
+        Route("POST /api/forms/kpi-suzdal", "POST", "/api/forms/kpi-suzdal", 2, kpi_feedback_form),
+        Route(
+            "POST /api/forms/monitoring-kostroma?durable",
+            "POST",
+            "/api/forms/monitoring-kostroma?durable=true",
+            1,
+            monitoring_form,
+        ),
+        Route("GET /api/data/monitoring-kostroma", "GET", "/api/data/monitoring-kostroma", 4),
+        Route("GET /api/data/crowdsourcing-roads", "GET", "/api/data/crowdsourcing-roads", 4),
+        Route("GET /api/data/crowdsourcing-roads/crosstab", "GET", "/api/data/crowdsourcing-roads/crosstab", 2),
+        Route("GET /api/cache/datasets", "GET", "/api/cache/datasets", 0.5),
+        Route("GET /api/data/kpi-suzdal", "GET", "/api/data/kpi-suzdal", 3),
+        Route("GET /api/data/digital-inequality", "GET", "/api/data/digital-inequality", 3),
+        Route("GET /api/digital_inequality/report", "GET", "/api/digital_inequality/report", 2),
+        Route("POST /api/digital_inequality/predict", "POST", "/api/digital_inequality/predict", 2, predict_body(features)),
+        Route("GET /api/digital_inequality/data", "GET", "/api/digital_inequality/data", 1),
+        Route("GET /api/digital_inequality/model", "GET", "/api/digital_inequality/model", 1),
+        Route("GET /api/data/healthcare-nekrasovka", "GET", "/api/data/healthcare-nekrasovka", 2),
+        Route("GET /api/data/regional-digital-services", "GET", "/api/data/regional-digital-services", 2),
+        Route("GET /api/data/digital-inclusion-dfo", "GET", "/api/data/digital-inclusion-dfo", 2),
+        Route("GET /static/nekrasovka_health_map.html", "GET", "/static/nekrasovka_health_map.html", 0.5),
+        Route("GET /metrics", "GET", "/metrics", 0.5),
+        Route(
+            "POST /api/auth/login",
+            "POST",
+            "/api/auth/login",
+            0.5,
+            lambda rng: {"username": ADMIN[0], "password": ADMIN[1]},
+        ),
+        Route("GET /api/auth/me", "GET", "/api/auth/me", 3, auth=True),
+        Route("GET /api/auth/cache", "GET", "/api/auth/cache", 0.5, auth=True),
+        Route("GET /api/auth/login-stats", "GET", "/api/auth/login-stats", 0.5, auth=True),
+        Route("POST /api/auth/logout", "POST", "/api/auth/logout", 0.2, prepare=fresh_logout_token),
+    ]
+
+
+def prepare_environment(workdir: Path, rows: int, workers: int) -> None:
+    """Point the app at a scratch data directory and database, then seed them."""
+    data_dir = workdir / "data"
+    shutil.copytree(
+        BASE_DIR / "data", data_dir, ignore=shutil.ignore_patterns("*.cols", "seed_manifest.json", "*.tmp")
+    )
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    # все клиенты ходят с одного адреса
+    os.environ.setdefault("LOGIN_MAX_FAILURES_PER_IP", str(10**9))
+
+    import seed_data
+    import synthetic_data
+    from auth import get_password_hash
+    from database import SessionLocal
+    from import_forms import import_form_csvs
+    from models import User
+
+    seed_data.init_db_and_seed()
+    for name in SCALED_DATASETS:
+        synthetic_data.write_dataset(name, data_dir / synthetic_data.DATASETS[name].file_name, rows)
+    with SessionLocal() as db:
+        import_form_csvs(db, replace=True)
+        hashed = get_password_hash(LOGOUT_PASSWORD)
+        db.add_all(User(username=logout_user(worker), hashed_password=hashed) for worker in range(workers))
+        db.commit()
+
+
+def create_app():
+    """The application with the auth router mounted (also the uvicorn factory)."""
+    import auth
+    from main import app
+
+    app.include_router(auth.router)
+    return app
+
+
+def percentile(ordered: List[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] * 1000 if ordered else 0.0
+
+
+def summarize(samples: List[float], errors: int, statuses: Dict[int, int], seconds: float) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / seconds, 2),
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2) if ordered else 0.0,
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run_mix(client, routes: List[Route], concurrency: int, seconds: float, seed: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    login = await client.post("/api/auth/login", json={"username": ADMIN[0], "password": ADMIN[1]})
+    admin_headers = {"Authorization": f"Bearer {login.json().get('access_token', '')}"} if login.status_code == 200 else {}
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    weights = [route.weight for route in routes]
+    deadline = time.perf_counter() + seconds
+
+    async def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            route = rng.choices(routes, weights)[0]
+            headers = dict(admin_headers) if route.auth else {}
+            if route.prepare is not None:
+                prepared = await route.prepare(client, index)
+                if prepared is None:
+                    continue
+                headers.update(prepared)
+            body = route.body(rng) if route.body else None
+            started = time.perf_counter()
+            try:
+                response = await client.request(route.method, route.path, json=body, headers=headers)
+            except httpx.TransportError:
+                # после необработанного исключения uvicorn закрывает соединение, а клиент мог уже
+                # взять его из пула; браузер в этом случае повторяет запрос — повторяем и мы
+                try:
+                    response = await client.request(route.method, route.path, json=body, headers=headers)
+                except httpx.TransportError:
+                    statuses[route.name][0] += 1
+                    continue
+            samples[route.name].append(time.perf_counter() - started)
+            statuses[route.name][response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        route.name: summarize(
+            samples[route.name],
+            sum(count for code, count in statuses[route.name].items() if not 200 <= code < 400),
+            statuses[route.name],
+            elapsed,
+        )
+        for route in routes
+    }
+
+
+async def run_inprocess(routes: List[Route], concurrency: int, seconds: float, seed: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        # необработанное исключение в обработчике — это ответ 500, а не падение прогона
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_mix(client, routes, concurrency, seconds, seed)
+
+
+def run_uvicorn(routes: List[Route], concurrency: int, seconds: float, seed: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from login_load import free_port, wait_for_server
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "http_suite:create_app", "--factory", "--app-dir", str(Path(__file__).parent),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BASE_DIR), os.getenv("PYTHONPATH")]))},
+    )
+
+    async def session() -> Dict[str, Dict[str, Any]]:
+        limits = httpx.Limits(max_connections=concurrency + 2)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            return await run_mix(client, routes, concurrency, seconds, seed)
+
+    try:
+        wait_for_server(port)
+        return asyncio.run(session())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float, min_delta_ms: float
+) -> List[Tuple[str, str]]:
+    """Routes that got slower or serve less than the baseline, with the reason."""
+    regressions: List[Tuple[str, str]] = []
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if not base or not stats["requests"]:
+            continue
+        slower = stats["p95_ms"] - base["p95_ms"]
+        if slower > min_delta_ms and stats["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append((name, f"p95 {base['p95_ms']} -> {stats['p95_ms']} ms"))
+        if base["rps"] and stats["rps"] < base["rps"] * (1 - threshold):
+            regressions.append((name, f"throughput {base['rps']} -> {stats['rps']} req/s"))
+        if stats["errors"] and not base.get("errors"):
+            regressions.append((name, f"{stats['errors']} errors, baseline had none"))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows in each scaled form dataset")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the run as JSON here")
+    parser.add_argument("--baseline", type=Path, help=f"compare with this run (e.g. {DEFAULT_BASELINE.name})")
+    parser.add_argument("--save-baseline", type=Path, nargs="?", const=DEFAULT_BASELINE, help="store the run as baseline")
+    parser.add_argument("--threshold", type=float, default=0.5, help="relative change counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="http-suite-"))
+    try:
+        prepared = time.perf_counter()
+        prepare_environment(workdir, args.rows, args.concurrency)
+        print(f"Prepared {args.rows} rows per form dataset in {time.perf_counter() - prepared:.1f}s", file=sys.stderr)
+
+        from database import SessionLocal
+        from models import Task
+
+        with SessionLocal() as db:
+            task_slug = db.query(Task.slug).order_by(Task.task_number).first()[0]
+        model_artifact = json.loads((BASE_DIR / "digital_inequality_model.json").read_text(encoding="utf-8"))
+        routes = build_routes(task_slug, len(model_artifact["feature_names"]))
+
+        if args.mode == "inprocess":
+            results = asyncio.run(run_inprocess(routes, args.concurrency, args.seconds, args.seed))
+        else:
+            results = run_uvicorn(routes, args.concurrency, args.seconds, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    run = {
+        "meta": {
+            "mode": args.mode,
+            "rows": args.rows,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "routes": results,
+    }
+    print(f"{'route':<48} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}")
+    for name, stats in results.items():
+        print(
+            f"{name:<48} {stats['rps']:>8} {stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['errors']:>5}"
+        )
+    for path in filter(None, (args.output, args.save_baseline)):
+        path.write_text(json.dumps(run, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline["meta"].get("mode") != args.mode or baseline["meta"].get("rows") != args.rows:
+            print("warning: baseline was recorded with different --mode/--rows", file=sys.stderr)
+        regressions = compare(results, baseline["routes"], args.threshold, args.min_delta_ms)
+        for name, reason in regressions:
+            print(f"REGRESSION {name}: {reason}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark of login throughput against the latency of other endpoints.
+
+Creates users with real bcrypt hashes in a fresh database in a temporary
+directory and starts the application (with the auth router mounted) in a
+uvicorn subprocess, so the load generator does not share the GIL with
+the server. Then for every login concurrency level runs logins and a steady
+stream of GETs to ``--path`` side by side. Clients that get 429 wait for
+``Retry-After`` (at most a second) like a browser would. Reports logins per
+second, how many were refused with 429, and GET latency percentiles;
+level 0 is the baseline without logins.
+
+    python benchmarks/login_load.py --concurrency 0 20 200 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+
+def create_app():
+    """uvicorn factory for the server subprocess: the application plus the auth router."""
+    import auth
+    from main import app
+
+    app.include_router(auth.router)
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] * 1000 if ordered else 0.0
+
+
+def create_users(count: int) -> None:
+    from auth import get_password_hash
+    from database import SessionLocal
+    from models import User
+
+    hashed = get_password_hash("student")
+    with SessionLocal() as db:
+        db.add_all(User(username=f"student{number}", hashed_password=hashed) for number in range(count))
+        db.commit()
+
+
+async def run_level(base_url: str, path: str, concurrency: int, readers: int, seconds: float, users: int) -> Dict[str, float]:
+    import httpx
+
+    started_at = time.perf_counter()
+    deadline = started_at + seconds
+    statuses: Counter = Counter()
+    get_latencies: List[float] = []
+    limits = httpx.Limits(max_connections=concurrency + readers + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def login_worker(index: int) -> None:
+            number = index
+            while time.perf_counter() < deadline:
+                response = await client.post(
+                    "/api/auth/login", json={"username": f"student{number % users}", "password": "student"}
+                )
+                statuses[response.status_code] += 1
+                number += concurrency
+                if response.status_code == 429:
+                    await asyncio.sleep(min(1.0, float(response.headers.get("retry-after", 1))))
+
+        async def reader() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get(path)
+                get_latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(login_worker(index) for index in range(concurrency)), *(reader() for _ in range(readers)))
+    # логины, принятые до дедлайна, дожидаются своей очереди на хеширование
+    elapsed = time.perf_counter() - started_at
+    return {
+        "login_concurrency": concurrency,
+        "logins_ok_per_s": round(statuses[200] / elapsed, 1),
+        "logins_429": statuses[429],
+        "logins_other": sum(count for code, count in statuses.items() if code not in (200, 429)),
+        "get_per_s": round(len(get_latencies) / seconds, 1),
+        "elapsed_s": round(elapsed, 2),
+        "get_p50_ms": round(percentile(get_latencies, 0.50), 2),
+        "get_p99_ms": round(percentile(get_latencies, 0.99), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[0, 20, 200], help="concurrent login clients per run")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent clients issuing GETs")
+    parser.add_argument("--path", default="/api/tasks", help="endpoint whose latency is measured")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench.db"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    # у каждого пользователя свой счётчик неудач, а все запросы идут с одного IP
+    os.environ.setdefault("LOGIN_MAX_FAILURES_PER_IP", str(10**9))
+
+    import models  # noqa: F401  (регистрирует таблицы для init_db)
+    from database import init_db
+
+    init_db()
+    create_users(args.users)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "login_load:create_app", "--factory", "--app-dir", str(Path(__file__).parent),
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BASE_DIR), os.getenv("PYTHONPATH")]))},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_server(port)
+        results = [
+            asyncio.run(run_level(base_url, args.path, level, args.readers, args.seconds, args.users))
+            for level in args.concurrency
+        ]
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'logins':>6} {'ok/s':>8} {'429':>6} {'other':>6} {'GET/s':>8} {'GET p50':>8} {'GET p99':>8} {'elapsed':>8}")
+    for row in results:
+        print(
+            f"{row['login_concurrency']:>6} {row['logins_ok_per_s']:>8} {row['logins_429']:>6} {row['logins_other']:>6} "
+            f"{row['get_per_s']:>8} {row['get_p50_ms']:>8} {row['get_p99_ms']:>8} {row['elapsed_s']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark of the SQLite pragma profiles under concurrent load.
+
+For every profile a fresh database in a temporary directory is filled
+with synthetic tasks and users. Reader threads then look up tasks by slug
+and users by username (the query behind login) through the read-only
+pool, while one writer thread inserts form rows through the read-write
+pool. Reports throughput and latency percentiles per operation.
+
+    python benchmarks/sqlite_profiles.py --threads 16 --seconds 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import SQLITE_PROFILES, Base, create_db_engine  # noqa: E402
+from models import MonitoringResponse, Task, User  # noqa: E402
+
+BLOCK = "Цифровое государство и качество городской среды. " * 400
+
+
+def fill(session_factory, tasks: int, users: int) -> None:
+    with session_factory() as db:
+        db.add_all(
+            Task(
+                slug=f"task-{number}",
+                title=f"Задание {number}",
+                short_description=BLOCK[:500],
+                task_number=number,
+                theory_block=BLOCK,
+                methodology_block=BLOCK,
+                data_block=BLOCK,
+                results_block=BLOCK,
+                conclusion_block=BLOCK,
+                links_block="https://example.org\n" * 10,
+            )
+            for number in range(tasks)
+        )
+        db.add_all(User(username=f"user{number}", hashed_password="x" * 60) for number in range(users))
+        db.commit()
+
+
+def percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))] * 1000 if ordered else 0.0
+
+
+def summarize(samples: List[float], seconds: float) -> Dict[str, float]:
+    return {
+        "ops_per_s": round(len(samples) / seconds, 1),
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def run_profile(profile: str, threads: int, seconds: float, tasks: int, users: int) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/bench.db"
+        write_engine = create_db_engine(url, profile=profile)
+        read_engine = create_db_engine(url, profile=profile, read_only=True, pool_size=threads)
+        Base.metadata.create_all(bind=write_engine)
+        WriteSession = sessionmaker(bind=write_engine)
+        ReadSession = sessionmaker(bind=read_engine)
+        fill(WriteSession, tasks, users)
+
+        samples: Dict[str, List[float]] = {"task_read": [], "login_lookup": [], "form_write": []}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def reader(index: int) -> None:
+            rng = random.Random(index)
+            operation = "task_read" if index % 2 == 0 else "login_lookup"
+            local: List[float] = []
+            with ReadSession() as db:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    if operation == "task_read":
+                        db.query(Task).filter(Task.slug == f"task-{rng.randrange(tasks)}").first()
+                    else:
+                        db.query(User).filter(User.username == f"user{rng.randrange(users)}").first()
+                    local.append(time.perf_counter() - started)
+                    db.expunge_all()
+                    db.rollback()
+            with lock:
+                samples[operation].extend(local)
+
+        def writer() -> None:
+            local: List[float] = []
+            with WriteSession() as db:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    db.add(
+                        MonitoringResponse(
+                            age=30, gender="ж", employment_type="Офис", life_quality_score=7, intent_to_leave="Остаюсь"
+                        )
+                    )
+                    db.commit()
+                    local.append(time.perf_counter() - started)
+            with lock:
+                samples["form_write"].extend(local)
+
+        workers = [threading.Thread(target=reader, args=(index,)) for index in range(threads)]
+        workers.append(threading.Thread(target=writer))
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        write_engine.dispose()
+        read_engine.dispose()
+    return {operation: summarize(values, seconds) for operation, values in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES))
+    parser.add_argument("--threads", type=int, default=8, help="reader threads (half tasks, half logins)")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    results = {profile: run_profile(profile, args.threads, args.seconds, args.tasks, args.users) for profile in args.profiles}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'profile':<10} {'operation':<13} {'ops/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for profile, operations in results.items():
+        for operation, stats in operations.items():
+            print(
+                f"{profile:<10} {operation:<13} {stats['ops_per_s']:>10} {stats['p50_ms']:>8} "
+                f"{stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
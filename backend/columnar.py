@@ -0,0 +1,161 @@
+"""Typed columnar mirror of the CSV datasets in DATA_DIR.
+
+``<name>.csv`` is mirrored into a ``<name>.cols/`` directory. Every rebuild
+writes a new generation subdirectory holding one ``.npy`` file per column,
+then atomically replaces ``meta.json``, which names that generation, and
+removes the older ones. Numeric columns are stored as raw arrays and loaded
+with ``mmap_mode="r"``; string columns are dictionary-encoded (int32 codes
++ the distinct values in ``meta.json``, kept as their own JSON types) and
+decoded on load back to the dtype ``pd.read_csv`` gave them, so a frame
+from the mirror equals the parsed CSV. A reader opens every file
+relative to the meta it read, so a concurrent rebuild can make a load fail
+(the caller then parses the CSV) but never pairs one generation's
+dictionaries with another's codes. The CSV stays the interchange format:
+the mirror records the CSV's mtime/size and is rebuilt whenever the CSV
+is newer.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 3
+META_FILE = "meta.json"
+
+
+def mirror_dir(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".cols")
+
+
+def read_meta(csv_path: Path) -> Optional[Dict[str, object]]:
+    meta_path = mirror_dir(csv_path) / META_FILE
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == FORMAT_VERSION else None
+
+
+def is_fresh(csv_path: Path, meta: Optional[Dict[str, object]] = None) -> bool:
+    meta = meta if meta is not None else read_meta(csv_path)
+    if meta is None:
+        return False
+    stat = csv_path.stat()
+    if meta["source_mtime_ns"] != stat.st_mtime_ns or meta["source_size"] != stat.st_size:
+        return False
+    return (mirror_dir(csv_path) / meta["generation"]).is_dir()
+
+
+def source_stamp(stat: os.stat_result) -> str:
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def write_columnar(csv_path: Path) -> Path:
+    """Parse the CSV once and publish it as a new generation of its mirror."""
+    stat = csv_path.stat()
+    df = pd.read_csv(csv_path)
+    target = mirror_dir(csv_path)
+    # Суффикс не даёт двум одновременным перестройкам писать в один каталог
+    generation = f"{source_stamp(stat)}-{uuid.uuid4().hex[:8]}"
+    staging = target / generation
+    staging.mkdir(parents=True)
+
+    columns = []
+    for index, name in enumerate(df.columns):
+        series = df[name]
+        file_name = f"{index}.npy"
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            np.save(staging / file_name, values)
+            columns.append({"name": name, "kind": "numeric", "file": file_name, "dtype": str(values.dtype)})
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            np.save(staging / file_name, codes.astype(np.int32))
+            columns.append(
+                {
+                    "name": name,
+                    "kind": "dictionary",
+                    "file": file_name,
+                    "dtype": str(series.dtype),
+                    # без str(): в столбце object значения 1 и "1" должны остаться разными
+                    "dictionary": uniques.tolist(),
+                }
+            )
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "rows": len(df),
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "generation": generation,
+        "columns": columns,
+    }
+    pending_meta = target / f"{META_FILE}.{generation}"
+    pending_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(pending_meta, target / META_FILE)
+
+    # Удаляются только поколения более старых версий CSV (и файлы прежнего формата):
+    # поколение той же версии могла только что опубликовать параллельная перестройка.
+    # Читатель, успевший прочитать старый meta.json, получит OSError и прочитает CSV
+    current = read_meta(csv_path)
+    keep = current["generation"].rsplit("-", 1)[0] if current is not None else source_stamp(stat)
+    for entry in target.iterdir():
+        if entry.name.startswith(META_FILE) or entry.name.startswith(keep + "-"):
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+    return target
+
+
+def ensure_columnar(csv_path: Path) -> bool:
+    """Rebuild the mirror if it is missing or older than the CSV; return True if rebuilt."""
+    if is_fresh(csv_path):
+        return False
+    write_columnar(csv_path)
+    return True
+
+
+def load_columnar(csv_path: Path) -> Optional[pd.DataFrame]:
+    """Map a fresh mirror into a DataFrame without parsing.
+
+    Returns None if there is no fresh mirror or its generation was replaced
+    while loading.
+    """
+    meta = read_meta(csv_path)
+    if meta is None or not is_fresh(csv_path, meta):
+        return None
+    directory = mirror_dir(csv_path) / meta["generation"]
+    data = {}
+    try:
+        for column in meta["columns"]:
+            values = np.load(directory / column["file"], mmap_mode="r")
+            if column["kind"] == "dictionary":
+                dictionary = pd.array(column["dictionary"], dtype=column["dtype"])
+                data[column["name"]] = dictionary.take(values, allow_fill=True)
+            else:
+                data[column["name"]] = values
+    except (OSError, ValueError):
+        return None
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(csv_path: Path) -> pd.DataFrame:
+    """Refresh the mirror if needed and load it; falls back to the CSV if it cannot be written or read."""
+    try:
+        ensure_columnar(csv_path)
+    except OSError:
+        return pd.read_csv(csv_path)
+    frame = load_columnar(csv_path)
+    return frame if frame is not None else pd.read_csv(csv_path)
+
+
+def mirror_data_dir(data_dir: Path) -> Dict[str, bool]:
+    return {csv_path.name: ensure_columnar(csv_path) for csv_path in sorted(data_dir.glob("*.csv"))}
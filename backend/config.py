@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -7,7 +8,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent
-DATA_DIR = BASE_DIR / "data"
+# Datasets directory; benchmarks point it at a scratch copy
+DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR / "data")))
 STATIC_DIR = BASE_DIR / "static"
 STATIC_IMG_DIR = STATIC_DIR / "img"
 
@@ -16,7 +18,83 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120"))
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1) if DATABASE_URL.startswith("sqlite://") else DATABASE_URL,
+)
 ACCESS_TOKEN_EXPIRE_DELTA = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+# Verified tokens are cached per worker; revocations from other workers apply within the TTL
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))
+# bcrypt runs on its own pool; logins beyond threads + queue get 429
+PASSWORD_HASH_THREADS = int(os.getenv("PASSWORD_HASH_THREADS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+# Failed logins allowed per username / per client IP within the window (seconds).
+# The IP limit covers every user behind one address: raise it when a class or
+# office logs in from behind NAT
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "50"))
+LOGIN_FAILURE_WINDOW = float(os.getenv("LOGIN_FAILURE_WINDOW", "300"))
+
+# SQLite pragma profile applied to every pooled connection: safe | balanced | fast.
+# SQLITE_PRAGMAS is a JSON object overriding single pragmas, e.g. {"cache_size": -32000}.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "balanced")
+SQLITE_PRAGMAS = json.loads(os.getenv("SQLITE_PRAGMAS", "{}"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+# SQLite allows one writer at a time; more write connections only wait on the lock
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "2"))
+# Seconds between ANALYZE / WAL checkpoint runs (0 disables)
+DB_MAINTENANCE_INTERVAL = float(os.getenv("DB_MAINTENANCE_INTERVAL", "600"))
+# PASSIVE | FULL | RESTART | TRUNCATE
+DB_CHECKPOINT_MODE = os.getenv("DB_CHECKPOINT_MODE", "PASSIVE")
+
+FORM_WRITER_QUEUE_SIZE = int(os.getenv("FORM_WRITER_QUEUE_SIZE", "10000"))
+FORM_WRITER_BATCH_SIZE = int(os.getenv("FORM_WRITER_BATCH_SIZE", "500"))
+FORM_WRITER_FLUSH_INTERVAL = float(os.getenv("FORM_WRITER_FLUSH_INTERVAL", "0.2"))
+# none | durable (fsync only batches with durable submissions) | always
+FORM_WRITER_FSYNC = os.getenv("FORM_WRITER_FSYNC", "durable")
+FORM_WRITER_DURABLE_TIMEOUT = float(os.getenv("FORM_WRITER_DURABLE_TIMEOUT", "5"))
+
+DATASET_CACHE_MAX_MB = int(os.getenv("DATASET_CACHE_MAX_MB", "256"))
+
+PREDICT_MAX_ROWS = int(os.getenv("PREDICT_MAX_ROWS", "100000"))
+# Larger /predict bodies are refused before JSON parsing (about 256 bytes per scenario row)
+PREDICT_MAX_BODY_BYTES = int(os.getenv("PREDICT_MAX_BODY_BYTES", str(PREDICT_MAX_ROWS * 256)))
+
+TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", "100"))
+TASKS_PAGE_MAX = int(os.getenv("TASKS_PAGE_MAX", "500"))
+# How long a worker trusts its cached tasks version before re-reading it
+TASKS_VERSION_TTL = float(os.getenv("TASKS_VERSION_TTL", "1.0"))
+# How long a worker trusts its cached form table versions before re-reading them
+FORM_VERSION_TTL = float(os.getenv("FORM_VERSION_TTL", "1.0"))
+
+# Cache-Control for routes with ETag validation; CACHE_CONTROL_ROUTES is a JSON
+# object mapping route templates (e.g. "/api/tasks/{slug}") to overrides.
+CACHE_CONTROL_DEFAULT = os.getenv("CACHE_CONTROL_DEFAULT", "no-cache")
+CACHE_CONTROL_ROUTES = json.loads(os.getenv("CACHE_CONTROL_ROUTES", "{}"))
+
+# Threads for blocking file work (CSV parsing, dataset files) offloaded from async handlers
+FILE_IO_THREADS = int(os.getenv("FILE_IO_THREADS", "8"))
+
+# Processes generating the seed datasets (1 runs them in the seeding process)
+SEED_WORKERS = int(os.getenv("SEED_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Below this many rows to generate the pool costs more than it saves
+SEED_PARALLEL_MIN_ROWS = int(os.getenv("SEED_PARALLEL_MIN_ROWS", "50000"))
+
+# Request profiling: where profiles are written, how many are kept, the stack sampling
+# interval, an optional shared token accepted in X-Profile besides an admin bearer token,
+# and continuous profiling of every Nth request per route (0 disables it)
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", "0"))
+
+# Modules imported by a background thread after startup (empty to disable)
+WARMUP_MODULES = [name for name in os.getenv("WARMUP_MODULES", "numpy,pandas,columnar,seed_data").split(",") if name]
+# Budgets checked by startup_profile.py for `import main`
+STARTUP_IMPORT_BUDGET_S = float(os.getenv("STARTUP_IMPORT_BUDGET_S", "1.5"))
+STARTUP_RSS_BUDGET_MB = float(os.getenv("STARTUP_RSS_BUDGET_MB", "150"))
 
 ALLOWED_ORIGINS = [
     FRONTEND_ORIGIN,
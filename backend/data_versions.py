@@ -0,0 +1,55 @@
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from models import DataVersion
+
+TASKS = "tasks"
+
+
+def bump_data_version(db_session: Session, name: str) -> Tuple[int, float]:
+    """Increment the version of ``name``; the caller commits."""
+    row = db_session.get(DataVersion, name)
+    if row is None:
+        row = DataVersion(name=name, version=0, updated_at=time.time())
+        db_session.add(row)
+    row.version += 1
+    row.updated_at = time.time()
+    return row.version, row.updated_at
+
+
+def read_data_version(db_session: Session, name: str) -> Tuple[int, Optional[float]]:
+    row = db_session.get(DataVersion, name)
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
+
+
+class CachedDataVersion:
+    """Version of ``name`` re-read from the database at most once per ``ttl`` seconds.
+
+    Bumps made by other processes (``seed_data``) become visible within ``ttl``.
+    """
+
+    def __init__(self, name: str, session_factory: async_sessionmaker, ttl: float) -> None:
+        self.name = name
+        self.ttl = ttl
+        self._session_factory = session_factory
+        self._value: Optional[Tuple[int, Optional[float]]] = None
+        self._expires = 0.0
+
+    async def get(self) -> Tuple[int, Optional[float]]:
+        now = time.monotonic()
+        if self._value is None or now >= self._expires:
+            query = select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == self.name)
+            async with self._session_factory() as db:
+                row = (await db.execute(query)).first()
+            self._value = (row.version, row.updated_at) if row is not None else (0, None)
+            self._expires = now + self.ttl
+        return self._value
+
+    def invalidate(self) -> None:
+        self._expires = 0.0
@@ -1,29 +1,183 @@
-from typing import Iterator
+import time
+from typing import AsyncIterator, Dict, Iterator, Optional
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-from config import DATABASE_URL
-
-engine = create_engine(
+from config import (
+    ASYNC_DATABASE_URL,
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+    DB_READ_POOL_SIZE,
+    DB_WRITE_POOL_SIZE,
+    SQLITE_PRAGMAS,
+    SQLITE_PROFILE,
 )
-if DATABASE_URL.startswith("sqlite"):
-    with engine.connect() as conn:
-        conn.execute(text("PRAGMA journal_mode=WAL;"))
+from metrics import PHASE_SECONDS
+from task_search import ensure_search_index
+
+# Профили PRAGMA для SQLite: safe — максимальная надёжность, balanced — WAL + NORMAL
+# (транзакция может потеряться только при отключении питания), fast — для бенчмарков и демо
+SQLITE_PROFILES: Dict[str, Dict[str, object]] = {
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+
+def sqlite_pragmas(profile: str, overrides: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    return {**SQLITE_PROFILES[profile], **(overrides or {})}
+
+
+def apply_pragmas(dbapi_connection, pragmas: Dict[str, object], read_only: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            # journal_mode хранится в файле базы и меняется только пишущим соединением
+            if name == "journal_mode" and read_only:
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def configure_engine(sync_engine: Engine, pragmas: Dict[str, object], read_only: bool) -> None:
+    """Apply the pragma profile to every new connection of the pool."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        apply_pragmas(dbapi_connection, pragmas, read_only)
+
+
+def time_statements(sync_engine: Engine) -> None:
+    """Record the execution time of every statement as the ``sql`` phase."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info["statement_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        PHASE_SECONDS.observe(time.perf_counter() - conn.info["statement_started"], "sql")
+
+
+def create_db_engine(
+    url: str,
+    profile: str = SQLITE_PROFILE,
+    read_only: bool = False,
+    pool_size: Optional[int] = None,
+    overrides: Optional[Dict[str, object]] = None,
+) -> Engine:
+    pool_size = pool_size or (DB_READ_POOL_SIZE if read_only else DB_WRITE_POOL_SIZE)
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=pool_size)
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=pool_size if read_only else 0,
+    )
+    configure_engine(new_engine, sqlite_pragmas(profile, overrides), read_only)
+    return new_engine
+
+
+def create_async_db_engine(
+    url: str,
+    profile: str = SQLITE_PROFILE,
+    read_only: bool = False,
+    pool_size: Optional[int] = None,
+    overrides: Optional[Dict[str, object]] = None,
+) -> AsyncEngine:
+    pool_size = pool_size or (DB_READ_POOL_SIZE if read_only else DB_WRITE_POOL_SIZE)
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, pool_size=pool_size)
+    new_engine = create_async_engine(url, pool_size=pool_size, max_overflow=pool_size if read_only else 0)
+    configure_engine(new_engine.sync_engine, sqlite_pragmas(profile, overrides), read_only)
+    return new_engine
+
+
+# Пишущие и читающие соединения живут в разных пулах: читатели в WAL не ждут писателя,
+# а query_only защищает их от случайной записи
+engine = create_db_engine(DATABASE_URL, overrides=SQLITE_PRAGMAS)
+read_engine = create_db_engine(DATABASE_URL, read_only=True, overrides=SQLITE_PRAGMAS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Асинхронный движок для обработчиков async def (sqlite+aiosqlite по умолчанию)
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL, overrides=SQLITE_PRAGMAS)
+async_read_engine = create_async_db_engine(ASYNC_DATABASE_URL, read_only=True, overrides=SQLITE_PRAGMAS)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+for timed_engine in (engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine):
+    time_statements(timed_engine)
 Base = declarative_base()
 
 
+def add_missing_columns(connection: Connection) -> None:
+    """Add columns that were added to models after their table was created.
+
+    ``create_all`` never alters existing tables; new columns must be nullable
+    or carry a ``server_default`` to be added this way.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(connection.dialect)}"
+            if column.server_default is not None:
+                default = str(column.server_default.arg).replace("'", "''")
+                ddl += f"{'' if column.nullable else ' NOT NULL'} DEFAULT '{default}'"
+            connection.exec_driver_sql(ddl)
+
+
 def init_db() -> None:
     """Create database schema if it does not exist."""
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        add_missing_columns(conn)
+        ensure_search_index(conn)
 
 
 def get_db() -> Iterator[Session]:
     db = SessionLocal()
     try:
-        yield db
+        with PHASE_SECONDS.time("db_session"):
+            yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        with PHASE_SECONDS.time("db_session"):
+            yield db
@@ -0,0 +1,106 @@
+"""Process-wide cache of parsed CSV datasets.
+
+Entries are keyed by path and validated against the file's
+(mtime, size, inode) on every lookup, so a rewritten CSV is re-parsed on
+the next request. A fresh columnar mirror is memory-mapped instead of
+parsing the CSV. Total memory is bounded with LRU eviction. pandas is
+imported on the first lookup, not when the module is imported.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from metrics import PHASE_SECONDS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FileStamp = Tuple[int, int, int]
+
+
+def import_pandas():
+    import pandas as pd
+
+    if int(pd.__version__.split(".")[0]) < 3 and not pd.get_option("mode.copy_on_write"):
+        # Cached frames are shared between requests; copy-on-write keeps the
+        # shallow copies handed out below from writing into them.
+        pd.set_option("mode.copy_on_write", True)
+    return pd
+
+
+def file_stamp(path: Path) -> FileStamp:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+@dataclass
+class CacheEntry:
+    stamp: FileStamp
+    frame: "pd.DataFrame"
+    nbytes: int
+
+
+class DatasetCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Path, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read_csv(self, path: Path) -> "pd.DataFrame":
+        """Return the parsed CSV; callers must treat the frame as read-only."""
+        stamp = file_stamp(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry.frame.copy(deep=False)
+            self.misses += 1
+
+        pd = import_pandas()
+        from columnar import load_columnar
+
+        with PHASE_SECONDS.time("csv_parse"):
+            frame = load_columnar(path)
+            if frame is None:
+                frame = pd.read_csv(path)
+        entry = CacheEntry(stamp, frame, int(frame.memory_usage(index=True, deep=True).sum()))
+        with self._lock:
+            self._store(path, entry)
+        return frame.copy(deep=False)
+
+    def _store(self, path: Path, entry: CacheEntry) -> None:
+        previous = self._entries.pop(path, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        if entry.nbytes > self.max_bytes:
+            return
+        self._entries[path] = entry
+        self._bytes += entry.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
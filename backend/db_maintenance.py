@@ -0,0 +1,63 @@
+"""Periodic SQLite upkeep: planner statistics and WAL checkpoints.
+
+A daemon thread runs ``ANALYZE`` (bounded by ``analysis_limit``) and
+``PRAGMA optimize`` so the query planner sees current statistics, then
+checkpoints the WAL so it does not grow without bound while readers keep
+old snapshots open. Does nothing on other databases.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+class DatabaseMaintenance:
+    def __init__(self, engine: Engine, interval: float, checkpoint_mode: str = "PASSIVE", analysis_limit: int = 1000) -> None:
+        if checkpoint_mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Unknown checkpoint mode: {checkpoint_mode}")
+        self.engine = engine
+        self.interval = interval
+        self.checkpoint_mode = checkpoint_mode
+        self.analysis_limit = analysis_limit
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, int]:
+        """Run one maintenance pass; returns the checkpoint result (busy, log and checkpointed frames)."""
+        if self.engine.dialect.name != "sqlite":
+            return {}
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql(f"PRAGMA analysis_limit={self.analysis_limit}")
+            connection.exec_driver_sql("ANALYZE")
+            connection.exec_driver_sql("PRAGMA optimize")
+            connection.commit()
+            busy, log, checkpointed = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({self.checkpoint_mode})").one()
+        result = {"busy": busy, "log": log, "checkpointed": checkpointed}
+        logger.info("SQLite maintenance done: %s", result)
+        return result
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("SQLite maintenance failed")
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,180 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from data_versions import bump_data_version
+from database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("none", "durable", "always")
+
+
+class FormWriterFull(RuntimeError):
+    """Raised when the submission queue stays full longer than the enqueue timeout."""
+
+
+@dataclass(frozen=True)
+class TableTarget:
+    model: type
+    # Вызывается после коммита с батчем, новой версией данных таблицы и её временем
+    on_commit: Optional[Callable[[List[Dict[str, object]], int, float], None]] = None
+
+    def write_batch(self, rows: List[Dict[str, object]], fsync: bool) -> None:
+        """Insert the batch with one executemany in a single transaction.
+
+        The transaction also bumps the table's data version, and ``on_commit``
+        receives the batch only once it is committed. On SQLite ``fsync``
+        switches the commit to ``synchronous=FULL`` so the WAL is synced
+        before the batch is acknowledged; other batches use the connection
+        profile's setting.
+        """
+        # Сессия работает поверх одного соединения: PRAGMA возвращается на том же
+        # соединении, иначе оно осталось бы в пуле с synchronous=FULL
+        with engine.connect() as connection:
+            raise_sync = fsync and connection.dialect.name == "sqlite"
+            if raise_sync:
+                previous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+                connection.exec_driver_sql("PRAGMA synchronous=FULL")
+                connection.commit()
+            try:
+                with SessionLocal(bind=connection) as session:
+                    session.execute(insert(self.model), rows)
+                    # версия поднимается после вставки: блокировка записи уже взята,
+                    # так что номер версии принадлежит именно этому батчу
+                    version, updated_at = bump_data_version(session, str(self))
+                    session.commit()
+            finally:
+                if raise_sync:
+                    connection.exec_driver_sql(f"PRAGMA synchronous={int(previous)}")
+                    connection.commit()
+        if self.on_commit is not None:
+            self.on_commit(rows, version, updated_at)
+
+    def __str__(self) -> str:
+        return self.model.__tablename__
+
+
+_STOP = object()
+
+
+class FormWriter:
+    """Background group-commit writer for form submissions.
+
+    Rows from all endpoints go through one bounded queue; a single thread
+    batches them per table and flushes a target once it collects
+    ``batch_size`` rows or ``flush_interval`` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        fsync_policy: str = "durable",
+        enqueue_timeout: float = 0.5,
+    ) -> None:
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="form-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Drain everything queued so far, flush it and stop the worker."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            self._thread = None
+
+    def submit(
+        self, target: TableTarget, row: Dict[str, object], durable: bool = False, block: bool = True
+    ) -> Optional[Future]:
+        """Queue a row; with ``durable`` return a future resolved after its batch is flushed.
+
+        With ``block=False`` a full queue raises ``FormWriterFull`` immediately
+        instead of waiting up to ``enqueue_timeout`` (for callers on the event loop).
+        """
+        future: Optional[Future] = Future() if durable else None
+        try:
+            self._queue.put((target, row, future), block=block, timeout=self.enqueue_timeout)
+        except queue.Full as exc:
+            raise FormWriterFull("Form submission queue is full") from exc
+        return future
+
+    def _run(self) -> None:
+        pending: Dict[TableTarget, List[Tuple[Dict[str, object], Optional[Future]]]] = {}
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._drain(pending)
+                self._flush_all(pending)
+                return
+
+            if item is not None:
+                target, row, future = item
+                batch = pending.setdefault(target, [])
+                batch.append((row, future))
+                if len(batch) >= self.batch_size:
+                    self._flush(target, pending.pop(target))
+
+            if time.monotonic() >= deadline:
+                self._flush_all(pending)
+                deadline = time.monotonic() + self.flush_interval
+
+    def _drain(self, pending: Dict[TableTarget, List[Tuple[Dict[str, object], Optional[Future]]]]) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is _STOP:
+                continue
+            target, row, future = item
+            pending.setdefault(target, []).append((row, future))
+
+    def _flush_all(self, pending: Dict[TableTarget, List[Tuple[Dict[str, object], Optional[Future]]]]) -> None:
+        for target in list(pending):
+            self._flush(target, pending.pop(target))
+
+    def _flush(self, target: TableTarget, batch: List[Tuple[Dict[str, object], Optional[Future]]]) -> None:
+        if not batch:
+            return
+        has_durable = any(future is not None for _, future in batch)
+        fsync = self.fsync_policy == "always" or (self.fsync_policy == "durable" and has_durable)
+        try:
+            target.write_batch([row for row, _ in batch], fsync=fsync)
+        except Exception as exc:  # noqa: BLE001 - the worker must survive a failed batch
+            logger.exception("Failed to flush %d rows to %s", len(batch), target)
+            for _, future in batch:
+                if future is not None:
+                    future.set_exception(exc)
+            return
+        for _, future in batch:
+            if future is not None:
+                future.set_result(None)
@@ -0,0 +1,145 @@
+"""Conditional GET support (ETag / Last-Modified / Cache-Control).
+
+Routes register a version function that cheaply describes the data behind
+the response (file stamps, model hash, table version counter). The
+middleware answers ``If-None-Match`` / ``If-Modified-Since`` with 304
+before the handler runs, so no pandas or ORM work is done for unchanged
+data, and stamps the validators on fresh 200 responses.
+"""
+
+import hashlib
+import inspect
+import re
+import threading
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from fastapi import Request
+from starlette.responses import Response
+
+# A version function returns (opaque version string, last modification as a
+# UNIX timestamp or None).
+Version = Tuple[str, Optional[float]]
+VersionFunc = Callable[[], Version]
+# Versions read from the database are fetched with the async session.
+AsyncVersionFunc = Callable[[], Awaitable[Version]]
+
+
+def files_version(*paths: Path) -> Version:
+    parts = []
+    last_modified = None
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            parts.append(f"{path.name}:missing")
+            continue
+        parts.append(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}")
+        last_modified = max(last_modified or 0.0, stat.st_mtime)
+    return "|".join(parts), last_modified
+
+
+_hash_lock = threading.Lock()
+_hash_cache: Dict[Path, Tuple[Tuple[int, int, int], str]] = {}
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of ``path``, recomputed only when its stat stamp changes."""
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with _hash_lock:
+        cached = _hash_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        cached = (stamp, digest)
+        with _hash_lock:
+            _hash_cache[path] = cached
+    return cached[1]
+
+
+def file_hash_version(path: Path) -> Version:
+    """Content hash of ``path`` as a version."""
+    try:
+        digest = file_sha256(path)
+        last_modified = path.stat().st_mtime
+    except FileNotFoundError:
+        return f"{path.name}:missing", None
+    return f"{path.name}:{digest}", last_modified
+
+
+def combine_versions(*versions: Version) -> Version:
+    modified = [last_modified for _, last_modified in versions if last_modified is not None]
+    return "|".join(tag for tag, _ in versions), max(modified) if modified else None
+
+
+@dataclass
+class CachePolicy:
+    pattern: "re.Pattern[str]"
+    version: Union[VersionFunc, AsyncVersionFunc]
+    cache_control: str
+
+
+def route_pattern(path: str) -> "re.Pattern[str]":
+    parts = re.split(r"(\{[^/]+?\})", path)
+    return re.compile("^" + "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts) + "$")
+
+
+class ConditionalResponses:
+    def __init__(self, default_cache_control: str, overrides: Optional[Dict[str, str]] = None) -> None:
+        self.default_cache_control = default_cache_control
+        self.overrides = overrides or {}
+        self._policies: List[CachePolicy] = []
+
+    def register(self, path: str, version: Union[VersionFunc, AsyncVersionFunc], cache_control: Optional[str] = None) -> None:
+        """Attach a version function to a route template such as ``/api/tasks/{slug}``."""
+        policy = self.overrides.get(path) or cache_control or self.default_cache_control
+        self._policies.append(CachePolicy(route_pattern(path), version, policy))
+
+    def policy_for(self, path: str) -> Optional[CachePolicy]:
+        for policy in self._policies:
+            if policy.pattern.match(path):
+                return policy
+        return None
+
+    async def middleware(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        if request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+        policy = self.policy_for(request.url.path)
+        if policy is None:
+            return await call_next(request)
+
+        version = policy.version()
+        if inspect.isawaitable(version):
+            version = await version
+        tag, last_modified = version
+        material = f"{request.url.path}?{request.url.query}|{tag}"
+        etag = '"' + hashlib.sha1(material.encode("utf-8")).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": policy.cache_control}
+        if last_modified is not None:
+            headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(last_modified) <= since
@@ -0,0 +1,84 @@
+"""One-shot import of the legacy form CSVs in DATA_DIR into the submission tables."""
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from sqlalchemy import Integer, func, insert, select
+from sqlalchemy.orm import Session
+
+from config import DATA_DIR
+from data_versions import bump_data_version
+from database import SessionLocal, init_db
+from models import CrowdsourcingReport, KpiSuzdalFeedback, MonitoringResponse, NNIdea
+
+FORM_CSV_SOURCES = {
+    MonitoringResponse: DATA_DIR / "monitoring_kostroma_responses.csv",
+    CrowdsourcingReport: DATA_DIR / "crowdsourcing_roads_responses.csv",
+    NNIdea: DATA_DIR / "nn_gorod_idey_ideas.csv",
+    KpiSuzdalFeedback: DATA_DIR / "kpi_suzdal_feedback.csv",
+}
+
+
+def column_converters(model: type) -> Dict[str, Callable[[str], object]]:
+    converters: Dict[str, Callable[[str], object]] = {}
+    for column in model.__table__.columns:
+        if column.primary_key:
+            continue
+        if isinstance(column.type, Integer):
+            converters[column.key] = lambda value: int(float(value)) if value else None
+        elif column.nullable:
+            converters[column.key] = lambda value: value or None
+        else:
+            converters[column.key] = lambda value: value
+    return converters
+
+
+def read_rows(file_path: Path, model: type) -> Iterator[Dict[str, object]]:
+    converters = column_converters(model)
+    with file_path.open(newline="", encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            yield {key: convert(row.get(key, "")) for key, convert in converters.items()}
+
+
+def import_form_csvs(db_session: Session, chunk_size: int = 5000, replace: bool = False) -> Dict[str, int]:
+    """Stream each CSV into its table in ``chunk_size`` executemany batches.
+
+    Tables that already hold rows are skipped unless ``replace`` is set, so
+    running the importer twice never duplicates submissions. Each imported
+    table's data version is bumped in the same transaction, so the running
+    aggregates rebuild from it.
+    """
+    imported: Dict[str, int] = {}
+    for model, file_path in FORM_CSV_SOURCES.items():
+        table = model.__tablename__
+        if not file_path.exists():
+            continue
+        has_rows = db_session.execute(select(func.count()).select_from(model)).scalar()
+        if has_rows and not replace:
+            continue
+        if has_rows:
+            db_session.query(model).delete()
+        rows = read_rows(file_path, model)
+        count = 0
+        while True:
+            chunk: List[Dict[str, object]] = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            db_session.execute(insert(model), chunk)
+            count += len(chunk)
+        bump_data_version(db_session, table)
+        db_session.commit()
+        imported[table] = count
+    return imported
+
+
+if __name__ == "__main__":
+    init_db()
+    db = SessionLocal()
+    try:
+        for table, count in import_form_csvs(db).items():
+            print(f"{table}: импортировано {count} строк")
+    finally:
+        db.close()
@@ -0,0 +1,298 @@
+"""Digital inequality report: computed once per (dataset, model) version.
+
+The model is read from the compact JSON artifact written by
+``analysis_scripts/digital_inequality_regression.py`` (coefficients,
+intercept, feature names, training metrics and a hash of the training
+data), so neither building the report nor predicting needs sklearn. The
+pickle is only a fallback when no artifact exists. ``ReportCache``
+keeps the finished report and rebuilds it on a background thread when the
+CSV or the model file changes, serving the previous report meanwhile.
+
+NumPy and pandas are imported inside the functions that use them, so
+importing this module (and ``main``) stays cheap.
+"""
+
+import json
+import logging
+import math
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+
+from http_cache import Version, VersionFunc
+from metrics import PHASE_SECONDS
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "linear-regression"
+ARTIFACT_FORMAT_VERSION = 1
+
+FEATURE_COLUMNS = ["gdp_per_capita_k", "urban_share", "education_index", "elderly_share",
+                   "unemployment_rate", "internet_penetration", "infrastructure_exp_per_cap"]
+
+
+SCENARIOS = {
+    "optimistic": {
+        "name": "Оптимистичный",
+        "values": {
+            "gdp_per_capita_k": 1000,
+            "urban_share": 0.9,
+            "education_index": 0.9,
+            "elderly_share": 0.15,
+            "unemployment_rate": 0.05,
+            "internet_penetration": 0.95,
+            "infrastructure_exp_per_cap": 70
+        },
+    },
+    "pessimistic": {
+        "name": "Пессимистичный",
+        "values": {
+            "gdp_per_capita_k": 500,
+            "urban_share": 0.6,
+            "education_index": 0.5,
+            "elderly_share": 0.35,
+            "unemployment_rate": 0.12,
+            "internet_penetration": 0.5,
+            "infrastructure_exp_per_cap": 30
+        },
+    },
+}
+
+
+class ScenarioValidationError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class LinearModel:
+    """Coefficients of the fitted regression, enough to predict with plain NumPy."""
+
+    feature_names: Tuple[str, ...]
+    coef: "np.ndarray"
+    intercept: float
+    metrics: Optional[Dict[str, float]] = None
+    data_sha256: Optional[str] = None
+
+    @classmethod
+    def from_estimator(cls, model) -> "LinearModel":
+        import numpy as np
+
+        names = getattr(model, "feature_names_in_", FEATURE_COLUMNS)
+        return cls(tuple(str(name) for name in names), np.asarray(model.coef_, dtype=np.float64), float(model.intercept_))
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, object]) -> "LinearModel":
+        if artifact.get("format") != ARTIFACT_FORMAT or artifact.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            raise ValueError("Unsupported model artifact format")
+        import numpy as np
+
+        training = artifact.get("training") or {}
+        return cls(
+            tuple(artifact["feature_names"]),
+            np.asarray(artifact["coefficients"], dtype=np.float64),
+            float(artifact["intercept"]),
+            artifact.get("metrics"),
+            training.get("data_sha256"),
+        )
+
+    def predict(self, matrix: "np.ndarray") -> "np.ndarray":
+        return matrix @ self.coef + self.intercept
+
+    def scenario_matrix(self, rows: Sequence[Sequence[float]], feature_names: Optional[Sequence[str]] = None) -> "np.ndarray":
+        """Validate a batch of scenario rows at once and return it in model feature order."""
+        import numpy as np
+
+        names = tuple(feature_names) if feature_names is not None else self.feature_names
+        if sorted(names) != sorted(self.feature_names):
+            raise ScenarioValidationError(f"feature_names must be a permutation of {list(self.feature_names)}")
+        try:
+            matrix = np.asarray(rows, dtype=np.float64)
+        except ValueError as exc:
+            raise ScenarioValidationError("rows must be a rectangular list of numbers") from exc
+        if matrix.ndim != 2 or matrix.shape[1] != len(names):
+            raise ScenarioValidationError(f"every row must contain {len(names)} values")
+        bad_rows = np.flatnonzero(~np.isfinite(matrix).all(axis=1))
+        if bad_rows.size:
+            raise ScenarioValidationError(f"non-finite values in rows {bad_rows[:20].tolist()}")
+        if names != self.feature_names:
+            matrix = matrix[:, [names.index(name) for name in self.feature_names]]
+        return matrix
+
+
+def load_model(artifact_path: Path, pickle_path: Path) -> LinearModel:
+    """Load the JSON artifact; unpickle the sklearn estimator only if there is none."""
+    with PHASE_SECONDS.time("model_load"):
+        if artifact_path.exists():
+            return LinearModel.from_artifact(json.loads(artifact_path.read_text(encoding="utf-8")))
+        with open(pickle_path, 'rb') as f:
+            return LinearModel.from_estimator(pickle.load(f))
+
+
+def holdout_metrics(X: "pd.DataFrame", y: "pd.Series") -> Tuple[float, float]:
+    """R² and RMSE of a least-squares refit on an 80/20 split, as the analysis script reports them.
+
+    The split repeats ``train_test_split(test_size=0.2, random_state=42)``
+    (a seeded permutation, test rows first), so the numbers match the script
+    without importing sklearn into the API worker.
+    """
+    import numpy as np
+
+    features = X.to_numpy(dtype=np.float64)
+    target = y.to_numpy(dtype=np.float64)
+    n_test = math.ceil(0.2 * len(target))
+    order = np.random.RandomState(42).permutation(len(target))
+    test, train = order[:n_test], order[n_test:]
+
+    # Свободный член — столбец единиц в матрице плана
+    design = np.column_stack([features, np.ones(len(target))])
+    with PHASE_SECONDS.time("model_fit"):
+        coef, *_ = np.linalg.lstsq(design[train], target[train], rcond=None)
+
+    residual = target[test] - design[test] @ coef
+    ss_res = float(residual @ residual)
+    ss_tot = float(((target[test] - target[test].mean()) ** 2).sum())
+    # Как r2_score: при постоянной целевой переменной R² равен 1 или 0
+    r2 = 1.0 - ss_res / ss_tot if ss_tot else float(ss_res == 0.0)
+    return r2, math.sqrt(ss_res / n_test)
+
+
+class ModelCache:
+    def __init__(self, version: VersionFunc, load: Callable[[], LinearModel]) -> None:
+        self._version = version
+        self._load = load
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[str, LinearModel]] = None
+
+    def get(self) -> LinearModel:
+        tag, _ = self._version()
+        entry = self._entry
+        if entry is None or entry[0] != tag:
+            with self._lock:
+                entry = self._entry
+                if entry is None or entry[0] != tag:
+                    entry = (tag, self._load())
+                    self._entry = entry
+        return entry[1]
+
+
+def build_report(df: "pd.DataFrame", model: LinearModel, data_sha256: Optional[str] = None) -> Dict[str, object]:
+    """Return the digital inequality analysis report"""
+    import numpy as np
+
+    X = df[FEATURE_COLUMNS]
+    y = df["digital_inequality_index"]
+    
+    # Training metrics stored in the artifact are valid while the dataset is unchanged;
+    # otherwise re-evaluate on the current data
+    if model.metrics and data_sha256 is not None and model.data_sha256 == data_sha256:
+        r2, rmse = model.metrics["r2"], model.metrics["rmse"]
+    else:
+        r2, rmse = holdout_metrics(X, y)
+    
+    # Use the full model for coefficients and other data
+    full_y_pred = model.predict(df[list(model.feature_names)].to_numpy(dtype=np.float64))  # Use the loaded model for predictions
+    
+    # Calculate coefficients with feature names
+    coefficients = []
+    for feature, coef in zip(model.feature_names, model.coef):
+        coefficients.append({
+            "feature": feature,
+            "coefficient": float(coef),
+            "abs_coefficient": abs(float(coef))
+        })
+    
+    # Predict all scenarios with one matrix-vector product
+    scenario_matrix = np.array(
+        [[scenario["values"][feature] for feature in model.feature_names] for scenario in SCENARIOS.values()]
+    )
+    scenario_predictions = {
+        key: {**scenario, "prediction": float(prediction)}
+        for (key, scenario), prediction in zip(SCENARIOS.items(), model.predict(scenario_matrix))
+    }
+    
+    # Prepare data for charts using full dataset predictions
+    chart_data = []
+    for actual, predicted in zip(y.tolist(), full_y_pred.tolist()):
+        chart_data.append({
+            "actual": actual,
+            "predicted": predicted
+        })
+    
+    coefficient_chart_data = []
+    for item in coefficients:
+        coefficient_chart_data.append({
+            "feature": item["feature"],
+            "value": item["abs_coefficient"]
+        })
+    
+    return {
+        "model_stats": {
+            "r2": r2,
+            "rmse": rmse,
+            "intercept": model.intercept
+        },
+        "coefficients": coefficients,
+        "scenarios": scenario_predictions,
+        "chart_data": chart_data,
+        "coefficient_chart_data": coefficient_chart_data
+    }
+
+
+class ReportCache:
+    def __init__(self, version: VersionFunc, build: Callable[[], Dict[str, object]]) -> None:
+        self._version = version
+        self._build = build
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._entry: Optional[Tuple[Version, Dict[str, object]]] = None
+        self._refreshing = False
+
+    def version(self) -> Version:
+        """Version of the report that would be served right now."""
+        current = self._version()
+        entry = self._entry
+        if entry is None:
+            return current
+        if entry[0][0] != current[0]:
+            self.refresh_in_background()
+        return entry[0]
+
+    def get(self) -> Tuple[str, Dict[str, object]]:
+        """Return (version tag, report); builds synchronously only on the very first call."""
+        current = self._version()
+        entry = self._entry
+        if entry is None:
+            with self._build_lock:
+                entry = self._entry
+                if entry is None:
+                    entry = (current, self._build())
+                    self._entry = entry
+        elif entry[0][0] != current[0]:
+            self.refresh_in_background()
+        return entry[0][0], entry[1]
+
+    def refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="report-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            with self._build_lock:
+                version = self._version()
+                if self._entry is not None and self._entry[0][0] == version[0]:
+                    return
+                self._entry = (version, self._build())
+        except Exception:  # noqa: BLE001 - keep serving the previous report
+            logger.exception("Failed to rebuild the digital inequality report")
+        finally:
+            with self._lock:
+                self._refreshing = False
@@ -0,0 +1,111 @@
+"""In-memory throttling of failed login attempts.
+
+Failures are counted in a sliding window per username and per client IP.
+Once a key reaches its limit, further attempts are refused before the
+password is checked, so guessing costs the attacker a 429 and the server
+no bcrypt work. An admitted attempt is counted as a failure up front
+(``acquire``), so concurrent guesses cannot all pass the check while the
+first ones are still hashing; the reservation stays a failure on a wrong
+password and is withdrawn on success or when no password was checked. A
+successful login clears the username's counter; the IP counter only ages
+out, so one valid account does not unlock guessing of others. The IP
+limit is shared by everyone behind one address (a classroom or office
+behind NAT); such deployments should raise ``LOGIN_MAX_FAILURES_PER_IP``.
+The number of tracked keys is capped; the least recently failed ones are
+forgotten first.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict
+
+
+class AttemptWindow:
+    def __init__(self, max_attempts: int, window: float, max_keys: int) -> None:
+        self.max_attempts = max_attempts
+        self.window = window
+        self.max_keys = max_keys
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _prune(self, key: str, now: float) -> Deque[float]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def retry_after(self, key: str, now: float) -> float:
+        failures = self._prune(key, now)
+        if len(failures) < self.max_attempts:
+            return 0.0
+        return failures[0] + self.window - now
+
+    def record(self, key: str, now: float) -> None:
+        failures = self._prune(key, now)
+        if key not in self._failures:
+            self._failures[key] = failures
+        failures.append(now)
+        # хранить больше max_attempts отметок незачем
+        while len(failures) > self.max_attempts:
+            failures.popleft()
+        self._failures.move_to_end(key)
+        while len(self._failures) > self.max_keys:
+            self._failures.popitem(last=False)
+
+    def cancel(self, key: str) -> None:
+        """Withdraw the latest recorded attempt of ``key``."""
+        failures = self._failures.get(key)
+        if failures:
+            failures.pop()
+            if not failures:
+                del self._failures[key]
+
+    def reset(self, key: str) -> None:
+        self._failures.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+
+class LoginThrottle:
+    def __init__(self, per_user: int, per_ip: int, window: float, max_keys: int = 100_000) -> None:
+        self._lock = threading.Lock()
+        self._users = AttemptWindow(per_user, window, max_keys)
+        self._ips = AttemptWindow(per_ip, window, max_keys)
+        self.blocked = 0
+
+    def acquire(self, username: str, client_ip: str) -> float:
+        """Reserve an attempt, counted as a failure until released.
+
+        Returns the seconds until the next attempt is allowed; 0 means the
+        attempt was admitted and reserved.
+        """
+        now = time.monotonic()
+        user = username.lower()
+        with self._lock:
+            delay = max(self._users.retry_after(user, now), self._ips.retry_after(client_ip, now))
+            if delay > 0:
+                self.blocked += 1
+                return delay
+            self._users.record(user, now)
+            self._ips.record(client_ip, now)
+            return 0.0
+
+    def release(self, username: str, client_ip: str) -> None:
+        """Withdraw a reservation whose password was never checked (e.g. the hasher was busy)."""
+        with self._lock:
+            self._users.cancel(username.lower())
+            self._ips.cancel(client_ip)
+
+    def record_success(self, username: str, client_ip: str) -> None:
+        with self._lock:
+            self._users.reset(username.lower())
+            self._ips.cancel(client_ip)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"blocked": self.blocked, "tracked_users": len(self._users), "tracked_ips": len(self._ips)}
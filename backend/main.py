@@ -1,36 +1,180 @@
-import csv
+import asyncio
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import pandas as pd
-from fastapi import Depends, FastAPI, HTTPException, status
+import anyio
+from fastapi import FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
 
-from config import ALLOWED_ORIGINS, DATA_DIR, STATIC_DIR
-from database import get_db, init_db
-from models import Task
+from config import (
+    ALLOWED_ORIGINS,
+    CACHE_CONTROL_DEFAULT,
+    CACHE_CONTROL_ROUTES,
+    DATA_DIR,
+    DATASET_CACHE_MAX_MB,
+    DB_CHECKPOINT_MODE,
+    DB_MAINTENANCE_INTERVAL,
+    FILE_IO_THREADS,
+    FORM_VERSION_TTL,
+    FORM_WRITER_BATCH_SIZE,
+    FORM_WRITER_DURABLE_TIMEOUT,
+    FORM_WRITER_FLUSH_INTERVAL,
+    FORM_WRITER_FSYNC,
+    FORM_WRITER_QUEUE_SIZE,
+    PREDICT_MAX_BODY_BYTES,
+    PROFILE_DIR,
+    PROFILE_INTERVAL,
+    PROFILE_MAX_FILES,
+    PROFILE_SAMPLE_EVERY,
+    PROFILE_TOKEN,
+    STATIC_DIR,
+    TASKS_PAGE_MAX,
+    TASKS_PAGE_SIZE,
+    TASKS_VERSION_TTL,
+    WARMUP_MODULES,
+)
+from aggregates import CrowdsourcingAggregate, MonitoringAggregate
+from body_limit import BodyLimitMiddleware
+from database import AsyncReadSessionLocal, ReadSessionLocal, async_engine, async_read_engine, engine, init_db
+from data_versions import TASKS, CachedDataVersion
+from dataset_cache import DatasetCache
+from db_maintenance import DatabaseMaintenance
+from form_writer import FormWriter, FormWriterFull, TableTarget
+from inequality_report import ModelCache, ReportCache, ScenarioValidationError, build_report, load_model
+from http_cache import ConditionalResponses, Version, combine_versions, file_hash_version, file_sha256, files_version
+from response_cache import SerializedResponses, dumps
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from models import CrowdsourcingReport, KpiSuzdalFeedback, MonitoringResponse, NNIdea
+from request_profiler import ProfilingMiddleware
 from schemas import (
     CrowdsourcingRoadsForm,
     KpiSuzdalFeedbackForm,
     MonitoringKostromaForm,
     NNGorodIdeyForm,
+    ScenarioBatchRequest,
     TaskOut,
+    TaskSearchHit,
+    TaskSummaryOut,
 )
+from task_cache import InvalidCursor, TaskDetails, TaskSummaries
+from task_search import search_tasks
+from warmup import start_warmup
 
 app = FastAPI(title="Цифровое государство: учебный портал кейсов")
 
+NEKRASOVKA_DIR = DATA_DIR / "nekrasovka"
+MODEL_PATH = Path(__file__).parent / "digital_inequality_model.pkl"
+MODEL_ARTIFACT_PATH = Path(__file__).parent / "digital_inequality_model.json"
+KPI_SUZDAL_CSV = DATA_DIR / "kpi_suzdal_monthly.csv"
+DIGITAL_INEQUALITY_CSV = DATA_DIR / "digital_inequality_regions.csv"
+DIGITAL_INCLUSION_DFO_CSV = DATA_DIR / "digital_inclusion_dfo.csv"
+
+monitoring_aggregate = MonitoringAggregate(
+    ReadSessionLocal, CachedDataVersion(MonitoringResponse.__tablename__, AsyncReadSessionLocal, FORM_VERSION_TTL)
+)
+crowdsourcing_aggregate = CrowdsourcingAggregate(
+    ReadSessionLocal, CachedDataVersion(CrowdsourcingReport.__tablename__, AsyncReadSessionLocal, FORM_VERSION_TTL)
+)
+
+# Агрегат получает строки только после коммита их батча
+MONITORING_TARGET = TableTarget(MonitoringResponse, on_commit=monitoring_aggregate.apply)
+CROWDSOURCING_TARGET = TableTarget(CrowdsourcingReport, on_commit=crowdsourcing_aggregate.apply)
+NN_IDEAS_TARGET = TableTarget(NNIdea)
+KPI_FEEDBACK_TARGET = TableTarget(KpiSuzdalFeedback)
+
+dataset_cache = DatasetCache(max_bytes=DATASET_CACHE_MAX_MB * 1024 * 1024)
+serialized_responses = SerializedResponses()
+tasks_data_version = CachedDataVersion(TASKS, AsyncReadSessionLocal, TASKS_VERSION_TTL)
+task_summaries = TaskSummaries(AsyncReadSessionLocal)
+task_details = TaskDetails(AsyncReadSessionLocal)
+# Отдельный лимит потоков для чтения файлов, чтобы не занимать общий пул потоков
+file_io_limiter = anyio.CapacityLimiter(FILE_IO_THREADS)
+
+async def tasks_version() -> Version:
+    version, updated_at = await tasks_data_version.get()
+    return str(version), updated_at
+
+def kpi_suzdal_version() -> Version:
+    return files_version(KPI_SUZDAL_CSV)
+
+def digital_inequality_version() -> Version:
+    return files_version(DIGITAL_INEQUALITY_CSV)
+
+def digital_inequality_model_version() -> Version:
+    return file_hash_version(MODEL_ARTIFACT_PATH if MODEL_ARTIFACT_PATH.exists() else MODEL_PATH)
+
+def digital_inequality_report_version() -> Version:
+    return combine_versions(files_version(DIGITAL_INEQUALITY_CSV), digital_inequality_model_version())
+
+def digital_inclusion_dfo_version() -> Version:
+    return files_version(DIGITAL_INCLUSION_DFO_CSV)
+
+def healthcare_nekrasovka_version() -> Version:
+    return files_version(NEKRASOVKA_DIR / "coverage_stats.json", NEKRASOVKA_DIR / "health_facilities.geojson")
+
+model_cache = ModelCache(digital_inequality_model_version, lambda: load_model(MODEL_ARTIFACT_PATH, MODEL_PATH))
+report_cache = ReportCache(
+    digital_inequality_report_version,
+    lambda: build_report(
+        dataset_cache.read_csv(DIGITAL_INEQUALITY_CSV), model_cache.get(), file_sha256(DIGITAL_INEQUALITY_CSV)
+    ),
+)
+
+def is_admin_token(token: str) -> bool:
+    # auth (jose, passlib) импортируется только при первом запросе профиля
+    from auth import is_admin_token as check_admin_token
+    return check_admin_token(token)
+
+conditional_responses = ConditionalResponses(CACHE_CONTROL_DEFAULT, CACHE_CONTROL_ROUTES)
+conditional_responses.register("/api/tasks", tasks_version)
+conditional_responses.register("/api/tasks/{slug}", tasks_version)
+conditional_responses.register("/api/data/monitoring-kostroma", monitoring_aggregate.data_version)
+conditional_responses.register("/api/data/crowdsourcing-roads", crowdsourcing_aggregate.data_version)
+conditional_responses.register("/api/data/crowdsourcing-roads/crosstab", crowdsourcing_aggregate.data_version)
+conditional_responses.register("/api/data/kpi-suzdal", kpi_suzdal_version)
+conditional_responses.register("/api/data/digital-inequality", digital_inequality_version)
+conditional_responses.register("/api/digital_inequality/report", report_cache.version)
+conditional_responses.register("/api/data/digital-inclusion-dfo", digital_inclusion_dfo_version)
+conditional_responses.register("/api/data/healthcare-nekrasovka", healthcare_nekrasovka_version)
+# Размер тела проверяется до разбора JSON. Слой стоит под условными ответами: их
+# BaseHTTPMiddleware завернул бы HTTPException из чтения тела в ExceptionGroup
+app.add_middleware(BodyLimitMiddleware, limits={"/api/digital_inequality/predict": PREDICT_MAX_BODY_BYTES})
+app.middleware("http")(conditional_responses.middleware)
+
+# CORS добавляется поверх условных ответов, чтобы заголовки попадали и в ответы 304
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Разрешаем все источники для тестирования
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id"],
 )
+# Профилировщик оборачивает CORS, а метрики — профилировщик: его накладные расходы видны в задержках
+app.add_middleware(
+    ProfilingMiddleware,
+    routes=app.router.routes,
+    is_admin_token=is_admin_token,
+    directory=PROFILE_DIR,
+    token=PROFILE_TOKEN,
+    sample_every=PROFILE_SAMPLE_EVERY,
+    interval=PROFILE_INTERVAL,
+    max_files=PROFILE_MAX_FILES,
+)
+# Метрики — самый внешний слой: в задержку входят и CORS, и ответы 304
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
 
-NEKRASOVKA_DIR = DATA_DIR / "nekrasovka"
+form_writer = FormWriter(
+    max_queue=FORM_WRITER_QUEUE_SIZE,
+    batch_size=FORM_WRITER_BATCH_SIZE,
+    flush_interval=FORM_WRITER_FLUSH_INTERVAL,
+    fsync_policy=FORM_WRITER_FSYNC,
+)
+db_maintenance = DatabaseMaintenance(engine, DB_MAINTENANCE_INTERVAL, DB_CHECKPOINT_MODE)
 
 @app.on_event("startup")
 def startup_event() -> None:
@@ -38,238 +182,186 @@ def startup_event() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     STATIC_DIR.mkdir(parents=True, exist_ok=True)
     NEKRASOVKA_DIR.mkdir(parents=True, exist_ok=True)
+    monitoring_aggregate.rebuild()
+    crowdsourcing_aggregate.rebuild()
+    start_warmup(WARMUP_MODULES)
+    report_cache.refresh_in_background()
+    form_writer.start()
+    db_maintenance.start()
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await anyio.to_thread.run_sync(db_maintenance.stop)
+    await anyio.to_thread.run_sync(form_writer.stop)
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+async def enqueue_form_row(target: TableTarget, payload: BaseModel, durable: bool) -> JSONResponse:
+    """Hand a validated form row to the background writer.
+
+    By default the response is sent as soon as the row is queued; with
+    ``durable`` it waits until the batch containing the row is committed.
+    Neither case blocks the event loop: only a full queue is waited on in a
+    worker thread.
+    """
+    row = payload.model_dump()
+    try:
+        try:
+            future = form_writer.submit(target, row, durable=durable, block=False)
+        except FormWriterFull:
+            future = await anyio.to_thread.run_sync(
+                lambda: form_writer.submit(target, row, durable=durable), limiter=file_io_limiter
+            )
+    except FormWriterFull as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Сервис перегружен, повторите позже") from exc
+    if future is not None:
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(future), timeout=FORM_WRITER_DURABLE_TIMEOUT)
+        except asyncio.TimeoutError as exc:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Запись не подтверждена вовремя") from exc
+        except SQLAlchemyError as exc:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Не удалось сохранить ответ") from exc
+    return JSONResponse({"status": "ok"})
 
-def append_csv_row(file_path: Path, fieldnames: List[str], payload: Dict[str, str]) -> None:
-    file_exists = file_path.exists()
-    with file_path.open("a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(payload)
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Route latencies, response sizes and internal phase timings in the Prometheus text format"""
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
 
 # Все эндпоинты без аутентификации
-@app.get("/api/tasks", response_model=List[TaskOut])
-def list_tasks(db: Session = Depends(get_db)) -> List[TaskOut]:
-    tasks = db.query(Task).order_by(Task.task_number).all()
-    return [TaskOut.model_validate(task) for task in tasks]
+@app.get("/api/tasks", response_model=List[TaskSummaryOut])
+async def list_tasks(
+    cursor: Optional[str] = None,
+    limit: int = Query(TASKS_PAGE_SIZE, ge=1, le=TASKS_PAGE_MAX),
+) -> Response:
+    """Task summaries ordered by task_number; the next page's cursor is in ``X-Next-Cursor``"""
+    tag, _ = await tasks_version()
+    try:
+        body, next_cursor = await task_summaries.page(tag, cursor, limit)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор") from exc
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/api/tasks/search", response_model=List[TaskSearchHit])
+async def search_tasks_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+) -> Response:
+    """Full-text search over task content, best matches first"""
+    async with AsyncReadSessionLocal() as db:
+        hits = await search_tasks(db, q, limit)
+    return Response(content=dumps(hits), media_type="application/json")
 
 @app.get("/api/tasks/{slug}", response_model=TaskOut)
-def get_task(slug: str, db: Session = Depends(get_db)) -> TaskOut:
-    task = db.query(Task).filter(Task.slug == slug).first()
-    if not task:
+async def get_task(slug: str) -> Response:
+    tag, _ = await tasks_version()
+    body = await task_details.get(tag, slug)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    return TaskOut.model_validate(task)
+    return Response(content=body, media_type="application/json")
 
 @app.post("/api/forms/monitoring-kostroma")
-def submit_monitoring_form(payload: MonitoringKostromaForm) -> JSONResponse:
-    file_path = DATA_DIR / "monitoring_kostroma_responses.csv"
-    append_csv_row(
-        file_path,
-        ["age", "gender", "employment_type", "life_quality_score", "intent_to_leave", "comment"],
-        payload.model_dump(),
-    )
-    return JSONResponse({"status": "ok"})
+async def submit_monitoring_form(payload: MonitoringKostromaForm, durable: bool = False) -> JSONResponse:
+    return await enqueue_form_row(MONITORING_TARGET, payload, durable)
 
 @app.post("/api/forms/crowdsourcing-roads")
-def submit_crowdsourcing_form(payload: CrowdsourcingRoadsForm) -> JSONResponse:
-    file_path = DATA_DIR / "crowdsourcing_roads_responses.csv"
-    append_csv_row(file_path, ["district", "issue_type", "description", "priority"], payload.model_dump())
-    return JSONResponse({"status": "ok"})
+async def submit_crowdsourcing_form(payload: CrowdsourcingRoadsForm, durable: bool = False) -> JSONResponse:
+    return await enqueue_form_row(CROWDSOURCING_TARGET, payload, durable)
 
 @app.post("/api/forms/nn-gorod-idey")
-def submit_nn_ideas_form(payload: NNGorodIdeyForm) -> JSONResponse:
-    file_path = DATA_DIR / "nn_gorod_idey_ideas.csv"
-    append_csv_row(file_path, ["category", "title", "description", "expected_impact"], payload.model_dump())
-    return JSONResponse({"status": "ok"})
+async def submit_nn_ideas_form(payload: NNGorodIdeyForm, durable: bool = False) -> JSONResponse:
+    return await enqueue_form_row(NN_IDEAS_TARGET, payload, durable)
 
 @app.post("/api/forms/kpi-suzdal")
-def submit_kpi_feedback(payload: KpiSuzdalFeedbackForm) -> JSONResponse:
-    file_path = DATA_DIR / "kpi_suzdal_feedback.csv"
-    append_csv_row(
-        file_path,
-        ["service_name", "month", "wait_time_minutes", "satisfaction_score", "comment"],
-        payload.model_dump(),
-    )
-    return JSONResponse({"status": "ok"})
+async def submit_kpi_feedback(payload: KpiSuzdalFeedbackForm, durable: bool = False) -> JSONResponse:
+    return await enqueue_form_row(KPI_FEEDBACK_TARGET, payload, durable)
 
 @app.get("/api/data/monitoring-kostroma")
-def monitoring_dataset() -> Dict[str, object]:
-    df = pd.read_csv(DATA_DIR / "monitoring_kostroma_responses.csv")
-    rating_counts = (
-        df["life_quality_score"].value_counts().sort_index().reset_index(name="count").rename(columns={"index": "score"})
-    )
-    intent_share = round((df[df["intent_to_leave"] == "Планирую уехать"].shape[0] / len(df)) * 100, 1)
-    average_score = round(df["life_quality_score"].mean(), 1)
-    return {
-        "average_score": average_score,
-        "intent_share": intent_share,
-        "ratings_distribution": rating_counts.to_dict(orient="records"),
-    }
+async def monitoring_dataset() -> Response:
+    version = await monitoring_aggregate.data_version()
+    return serialized_responses.respond("monitoring-kostroma", lambda: version, monitoring_aggregate.snapshot)
 
 @app.get("/api/data/crowdsourcing-roads")
-def crowdsourcing_dataset() -> Dict[str, object]:
-    df = pd.read_csv(DATA_DIR / "crowdsourcing_roads_responses.csv")
-    by_issue = df["issue_type"].value_counts().reset_index(name="count").rename(columns={"index": "issue_type"})
-    by_district = df["district"].value_counts().reset_index(name="count").rename(columns={"index": "district"})
-    return {
-        "issues_by_type": by_issue.to_dict(orient="records"),
-        "issues_by_district": by_district.to_dict(orient="records"),
-    }
+async def crowdsourcing_dataset() -> Response:
+    version = await crowdsourcing_aggregate.data_version()
+    return serialized_responses.respond("crowdsourcing-roads", lambda: version, crowdsourcing_aggregate.snapshot)
+
+@app.get("/api/data/crowdsourcing-roads/crosstab")
+async def crowdsourcing_crosstab() -> Dict[str, object]:
+    """District × issue type × priority counts."""
+    await crowdsourcing_aggregate.data_version()
+    return crowdsourcing_aggregate.crosstab()
+
+@app.get("/api/cache/datasets")
+async def dataset_cache_stats() -> Dict[str, int]:
+    return dataset_cache.stats()
 
 @app.get("/api/data/kpi-suzdal")
-def kpi_suzdal_dataset() -> Dict[str, object]:
-    df = pd.read_csv(DATA_DIR / "kpi_suzdal_monthly.csv")
-    return {"monthly": df.to_dict(orient="records")}
+async def kpi_suzdal_dataset() -> Response:
+    return await serialized_responses.respond_async(
+        "kpi-suzdal",
+        kpi_suzdal_version,
+        lambda: {"monthly": dataset_cache.read_csv(KPI_SUZDAL_CSV).to_dict(orient="records")},
+        limiter=file_io_limiter,
+    )
 
 @app.get("/api/data/digital-inequality")
-def digital_inequality_dataset() -> Dict[str, object]:
-    df = pd.read_csv(DATA_DIR / "digital_inequality_regions.csv")
-    return {"regions": df.to_dict(orient="records")}
+async def digital_inequality_dataset() -> Response:
+    return await serialized_responses.respond_async(
+        "digital-inequality",
+        digital_inequality_version,
+        lambda: {"regions": dataset_cache.read_csv(DIGITAL_INEQUALITY_CSV).to_dict(orient="records")},
+        limiter=file_io_limiter,
+    )
 
 @app.get("/api/digital_inequality/report")
-def get_digital_inequality_report():
+def get_digital_inequality_report() -> Response:
     """Return the digital inequality analysis report"""
-    import pickle
-    from sklearn.linear_model import LinearRegression
-    from sklearn.model_selection import train_test_split
-    from sklearn.metrics import r2_score, mean_squared_error
-    
-    # Load the model
-    model_path = Path(__file__).parent / "digital_inequality_model.pkl"
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    # Load the data
-    df = pd.read_csv(DATA_DIR / "digital_inequality_regions.csv")
-    feature_columns = ["gdp_per_capita_k", "urban_share", "education_index", "elderly_share", 
-                       "unemployment_rate", "internet_penetration", "infrastructure_exp_per_cap"]
-    X = df[feature_columns]
-    y = df["digital_inequality_index"]
-    
-    # Split into train/test sets (80/20) for proper evaluation
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Train a model on the training set for proper evaluation
-    model_train_test = LinearRegression()
-    model_train_test.fit(X_train, y_train)
-    
-    # Make predictions on the test set for metrics
-    y_pred = model_train_test.predict(X_test)
-    
-    # Calculate metrics on test set
-    r2 = r2_score(y_test, y_pred)
-    mse = mean_squared_error(y_test, y_pred)
-    rmse = mse ** 0.5
-    
-    # Use the full model for coefficients and other data
-    full_y_pred = model.predict(X)  # Use the loaded model for predictions
-    
-    # Calculate coefficients with feature names
-    coefficients = []
-    for feature, coef in zip(feature_columns, model.coef_):
-        coefficients.append({
-            "feature": feature,
-            "coefficient": float(coef),
-            "abs_coefficient": abs(float(coef))
-        })
-    
-    # Define scenarios using model coefficients directly
-    optimistic_pred = (
-        model.coef_[0] * 1000 +  # gdp_per_capita_k
-        model.coef_[1] * 0.9 +   # urban_share
-        model.coef_[2] * 0.9 +   # education_index
-        model.coef_[3] * 0.15 +  # elderly_share
-        model.coef_[4] * 0.05 +  # unemployment_rate
-        model.coef_[5] * 0.95 +  # internet_penetration
-        model.coef_[6] * 70 +    # infrastructure_exp_per_cap
-        model.intercept_         # intercept
-    )
-    
-    pessimistic_pred = (
-        model.coef_[0] * 500 +   # gdp_per_capita_k
-        model.coef_[1] * 0.6 +   # urban_share
-        model.coef_[2] * 0.5 +   # education_index
-        model.coef_[3] * 0.35 +  # elderly_share
-        model.coef_[4] * 0.12 +  # unemployment_rate
-        model.coef_[5] * 0.5 +   # internet_penetration
-        model.coef_[6] * 30 +    # infrastructure_exp_per_cap
-        model.intercept_         # intercept
+    tag, report = report_cache.get()
+    return serialized_responses.respond("digital-inequality-report", lambda: (tag, None), lambda: report)
+
+@app.post("/api/digital_inequality/predict")
+def predict_digital_inequality(payload: ScenarioBatchRequest) -> Response:
+    """Predict the index for a batch of scenarios with one matrix-vector product"""
+    model = model_cache.get()
+    try:
+        matrix = model.scenario_matrix(payload.rows, payload.feature_names)
+    except ScenarioValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    predictions = model.predict(matrix)
+    return Response(
+        content=dumps({"feature_names": list(model.feature_names), "count": len(predictions), "predictions": predictions}),
+        media_type="application/json",
     )
-    
-    scenario_predictions = {
-        "optimistic": {
-            "name": "Оптимистичный",
-            "values": {
-                "gdp_per_capita_k": 1000,
-                "urban_share": 0.9,
-                "education_index": 0.9,
-                "elderly_share": 0.15,
-                "unemployment_rate": 0.05,
-                "internet_penetration": 0.95,
-                "infrastructure_exp_per_cap": 70
-            },
-            "prediction": float(optimistic_pred)
-        },
-        "pessimistic": {
-            "name": "Пессимистичный",
-            "values": {
-                "gdp_per_capita_k": 500,
-                "urban_share": 0.6,
-                "education_index": 0.5,
-                "elderly_share": 0.35,
-                "unemployment_rate": 0.12,
-                "internet_penetration": 0.5,
-                "infrastructure_exp_per_cap": 30
-            },
-            "prediction": float(pessimistic_pred)
-        }
-    }
-    
-    # Prepare data for charts using full dataset predictions
-    chart_data = []
-    for actual, predicted in zip(y.tolist(), full_y_pred.tolist()):
-        chart_data.append({
-            "actual": actual,
-            "predicted": predicted
-        })
-    
-    coefficient_chart_data = []
-    for item in coefficients:
-        coefficient_chart_data.append({
-            "feature": item["feature"],
-            "value": item["abs_coefficient"]
-        })
-    
-    return {
-        "model_stats": {
-            "r2": r2,
-            "rmse": rmse,
-            "intercept": float(model.intercept_)
-        },
-        "coefficients": coefficients,
-        "scenarios": scenario_predictions,
-        "chart_data": chart_data,
-        "coefficient_chart_data": coefficient_chart_data
-    }
 
 @app.get("/api/digital_inequality/data")
-def get_digital_inequality_data() -> FileResponse:
+async def get_digital_inequality_data() -> FileResponse:
     """Return the digital inequality dataset as a file"""
-    file_path = DATA_DIR / "digital_inequality_regions.csv"
-    if not file_path.exists():
+    if not DIGITAL_INEQUALITY_CSV.exists():
         raise HTTPException(status_code=404, detail="Dataset not found")
-    return FileResponse(file_path, media_type='text/csv', filename='digital_inequality_data.csv')
+    return FileResponse(DIGITAL_INEQUALITY_CSV, media_type='text/csv', filename='digital_inequality_data.csv')
 
 @app.get("/api/digital_inequality/model")
-def get_digital_inequality_model() -> FileResponse:
-    """Return the digital inequality model file"""
-    model_path = Path(__file__).parent / "digital_inequality_model.pkl"
-    if not model_path.exists():
+async def get_digital_inequality_model(format: str = "json") -> FileResponse:
+    """Return the digital inequality model: the JSON artifact, or the sklearn pickle with ?format=pickle"""
+    if format == "pickle":
+        path, media_type = MODEL_PATH, 'application/octet-stream'
+    elif format == "json":
+        path, media_type = MODEL_ARTIFACT_PATH, 'application/json'
+    else:
+        raise HTTPException(status_code=400, detail="Unknown model format")
+    if not path.exists():
         raise HTTPException(status_code=404, detail="Model file not found")
-    return FileResponse(model_path, media_type='application/octet-stream', filename='digital_inequality_model.pkl')
+    return FileResponse(path, media_type=media_type, filename=path.name)
 
 @app.get("/api/data/healthcare-nekrasovka")
-def healthcare_nekrasovka_dataset() -> Dict[str, object]:
+async def healthcare_nekrasovka_dataset() -> Response:
+    return await serialized_responses.respond_async(
+        "healthcare-nekrasovka", healthcare_nekrasovka_version, build_healthcare_nekrasovka_payload, file_io_limiter
+    )
+
+def build_healthcare_nekrasovka_payload() -> Dict[str, object]:
     stats_path = NEKRASOVKA_DIR / "coverage_stats.json"
     facilities_path = NEKRASOVKA_DIR / "health_facilities.geojson"
     if not stats_path.exists() or not facilities_path.exists():
@@ -298,10 +390,10 @@ def healthcare_nekrasovka_dataset() -> Dict[str, object]:
     }
 
 @app.get("/api/data/regional-digital-services")
-def regional_digital_services_dataset() -> Dict[str, object]:
+async def regional_digital_services_dataset() -> Dict[str, object]:
     # Получаем данные из существующего источника
     from seed_data import generate_digital_services_summary
-    data = generate_digital_services_summary()
+    data = await anyio.to_thread.run_sync(generate_digital_services_summary, limiter=file_io_limiter)
     
     # Подготовляем точки для карты с цифровой зрелостью регионов
     regions_data = [
@@ -342,11 +434,16 @@ def regional_digital_services_dataset() -> Dict[str, object]:
     }
 
 @app.get("/api/data/digital-inclusion-dfo")
-def digital_inclusion_dfo_dataset() -> Dict[str, object]:
+async def digital_inclusion_dfo_dataset() -> Response:
     """
     API endpoint для получения данных о цифровой инклюзивности органов власти ДФО
     """
-    df = pd.read_csv(DATA_DIR / "digital_inclusion_dfo.csv")
+    return await serialized_responses.respond_async(
+        "digital-inclusion-dfo", digital_inclusion_dfo_version, build_digital_inclusion_dfo_payload, file_io_limiter
+    )
+
+def build_digital_inclusion_dfo_payload() -> Dict[str, object]:
+    df = dataset_cache.read_csv(DIGITAL_INCLUSION_DFO_CSV)
     
     # Подготовим данные для визуализации
     authorities_data = df.to_dict(orient="records")
@@ -389,7 +486,7 @@ def digital_inclusion_dfo_dataset() -> Dict[str, object]:
     }
 
 @app.get("/static/nekrasovka_health_map.html")
-def get_nekrasovka_map() -> FileResponse:
+async def get_nekrasovka_map() -> FileResponse:
     map_file = STATIC_DIR / "nekrasovka_health_map.html"
     if not map_file.exists():
         raise HTTPException(status_code=404, detail="Карта Некрасовки не найдена")
@@ -0,0 +1,250 @@
+"""Request and phase metrics in the Prometheus text format.
+
+Every thread records into its own shard (a plain dict of label values ->
+list of numbers), so the request path never takes a lock: the event loop
+thread and each worker thread only ever write their own shard. A thread
+registers its shard once, on its first observation. ``render`` merges the
+shards when ``/metrics`` is scraped; copying a dict or list is a single
+operation under the GIL, so a scrape sees each cell either before or after
+a concurrent update, never half of one. At each scrape the shards of
+threads that have exited (anyio drops idle workers after a while) are
+folded into one retired total, so counters never go backwards and the
+number of shards stays bounded by the live threads.
+
+``MetricsMiddleware`` is a plain ASGI middleware recording latency,
+response size and in-flight requests per route template (not per raw path,
+to keep the label set bounded). ``PHASE_SECONDS`` times internal phases
+such as CSV parsing, model loading and password checks.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from starlette.routing import Match
+
+LabelValues = Tuple[str, ...]
+Shard = Dict[Tuple[str, LabelValues], List[float]]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def add_cells(totals: Shard, shard: Shard) -> None:
+    for key, cell in shard.copy().items():
+        cell = list(cell)
+        total = totals.get(key)
+        if total is None:
+            totals[key] = cell
+        else:
+            for index, value in enumerate(cell):
+                total[index] += value
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Shard]] = []
+        self._retired: Shard = {}
+        self._register_lock = threading.Lock()
+        self._metrics: List["Metric"] = []
+
+    def shard(self) -> Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register_lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def add(self, metric: "Metric") -> None:
+        self._metrics.append(metric)
+
+    def retire_dead_shards(self) -> List[Shard]:
+        """Fold the shards of exited threads into the retired total; returns the live shards."""
+        with self._register_lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # поток завершился — его shard больше никто не пишет
+                    add_cells(self._retired, shard)
+            self._shards = live
+            return [self._retired] + [shard for _, shard in live]
+
+    def merged(self) -> Dict[Tuple[str, LabelValues], List[float]]:
+        totals: Shard = {}
+        for shard in self.retire_dead_shards():
+            add_cells(totals, shard)
+        return totals
+
+    def render(self) -> str:
+        totals = self.merged()
+        by_metric: Dict[str, List[Tuple[LabelValues, List[float]]]] = {}
+        for (name, labels), cell in sorted(totals.items()):
+            by_metric.setdefault(name, []).append((labels, cell))
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, cell in by_metric.get(metric.name, ()):
+                lines.extend(metric.render(labels, cell))
+        return "\n".join(lines) + "\n"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.add(self)
+
+    def cell(self, labels: LabelValues, size: int) -> List[float]:
+        shard = self.registry.shard()
+        key = (self.name, labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [0.0] * size
+        return cell
+
+    def render(self, labels: LabelValues, cell: List[float]) -> List[str]:
+        return [f"{self.name}{format_labels(self.labelnames, labels)} {format_number(cell[0])}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.cell(labels, 1)[0] += amount
+
+
+class Gauge(Metric):
+    """A gauge moved up and down by deltas; the shards' deltas add up to the value."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.cell(labels, 1)[0] += amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.cell(labels, 1)[0] -= amount
+
+
+class Histogram(Metric):
+    """Cells hold the per-bucket (not cumulative) counts, the +Inf bucket, then the sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        cell = self.cell(labels, len(self.buckets) + 2)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self, labels: LabelValues, cell: List[float]) -> List[str]:
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), cell):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else format_number(bound)
+            lines.append(f"{self.name}_bucket{format_labels(names, labels + (le,))} {format_number(cumulative)}")
+        plain = format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{plain} {format_number(cell[-1])}")
+        lines.append(f"{self.name}_count{plain} {format_number(cumulative)}")
+        return lines
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = Histogram(
+    registry, "http_request_duration_seconds", "Time to the end of the response body.", ("method", "route", "status")
+)
+RESPONSE_BYTES = Histogram(
+    registry, "http_response_size_bytes", "Response body size.", ("method", "route"), buckets=SIZE_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(registry, "http_requests_in_flight", "Requests being served.", ("method",))
+PHASE_SECONDS = Histogram(registry, "app_phase_duration_seconds", "Time spent in internal phases.", ("phase",))
+
+
+def route_label(scope: Dict, routes: Sequence) -> str:
+    """Template of the route that served the request.
+
+    Responses produced before routing (304s from ``ConditionalResponses``)
+    leave no ``route`` in the scope; their template is found by matching.
+    """
+    route = scope.get("route")
+    if route is None:
+        route = next((route for route in routes if route.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app, routes: Sequence = ()) -> None:
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = "500"
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope, self.routes)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, method, route, status)
+            RESPONSE_BYTES.observe(size, method, route)
+            REQUESTS_IN_FLIGHT.dec(method)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text
+from sqlalchemy import Boolean, Column, Float, Integer, String, Text
 
 from database import Base
 
@@ -10,6 +10,8 @@ class User(Base):
     username = Column(String(50), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     is_admin = Column(Boolean, default=False)
+    # Увеличивается при выходе, смене пароля или прав: выпущенные ранее токены перестают действовать
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
 
 class Task(Base):
@@ -26,3 +28,58 @@ class Task(Base):
     results_block = Column(Text, nullable=False)
     conclusion_block = Column(Text, nullable=False)
     links_block = Column(Text, nullable=False)
+    # SHA-256 содержимого из seed_data: неизменённые задания при пересидировании не перезаписываются
+    content_hash = Column(String(64), nullable=True)
+
+
+class MonitoringResponse(Base):
+    __tablename__ = "monitoring_kostroma_responses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    age = Column(Integer, nullable=False)
+    gender = Column(String(50), nullable=False)
+    employment_type = Column(String(100), nullable=False)
+    life_quality_score = Column(Integer, nullable=False, index=True)
+    intent_to_leave = Column(String(50), nullable=False)
+    comment = Column(Text, nullable=True)
+
+
+class CrowdsourcingReport(Base):
+    __tablename__ = "crowdsourcing_roads_reports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    district = Column(String(100), nullable=False, index=True)
+    issue_type = Column(String(255), nullable=False, index=True)
+    description = Column(Text, nullable=False)
+    priority = Column(String(50), nullable=False)
+
+
+class NNIdea(Base):
+    __tablename__ = "nn_gorod_idey_ideas"
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String(100), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    expected_impact = Column(Text, nullable=False)
+
+
+class KpiSuzdalFeedback(Base):
+    __tablename__ = "kpi_suzdal_feedback"
+
+    id = Column(Integer, primary_key=True, index=True)
+    service_name = Column(String(255), nullable=False, index=True)
+    month = Column(String(7), nullable=False, index=True)
+    wait_time_minutes = Column(Integer, nullable=False)
+    satisfaction_score = Column(Integer, nullable=False)
+    comment = Column(Text, nullable=True)
+
+
+class DataVersion(Base):
+    """Monotonic version counters for tables whose readers cache derived responses."""
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(Float, nullable=False)
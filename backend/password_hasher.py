@@ -0,0 +1,69 @@
+"""Password hashing off the request threads.
+
+bcrypt is deliberately slow (tens of milliseconds of CPU per check) and
+releases the GIL, so it runs on its own small thread pool instead of the
+worker threads that serve every other endpoint. At most ``threads`` checks
+run at once and at most ``max_queue`` more wait; beyond that ``submit``
+raises ``HasherBusy`` right away and the caller answers 429 instead of
+letting a login burst pile up.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class HasherBusy(RuntimeError):
+    """Raised when every hashing slot and queue place is taken."""
+
+
+class PasswordHasher:
+    def __init__(self, threads: int, max_queue: int) -> None:
+        self.threads = threads
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(threads + max_queue)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, func: Callable[..., T], *args) -> "Future[T]":
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy("Password hashing queue is full")
+        with self._lock:
+            self.pending += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+        self._slots.release()
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "threads": self.threads,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,207 @@
+"""On-demand sampling profiler for single requests.
+
+A request is profiled when it carries an ``X-Profile`` header and is
+allowed to: either it also carries a bearer token of an admin user, or the
+header value equals ``PROFILE_TOKEN`` (when one is configured). Other
+requests with the header are served normally and not profiled. With
+``sample_every`` set, every Nth request of each route template is profiled
+as well, without any header.
+
+While the request is served a background thread samples the Python stacks
+of all threads every ``interval`` seconds, so handlers running on the event
+loop and in worker threads are both covered. Idle threads (waiting in
+``select`` or on a queue) are skipped. Only one request is profiled at a
+time; candidates arriving meanwhile are served unprofiled. Other requests
+served concurrently show up in the samples too, under their own frames.
+
+The samples are written as ``<id>.folded`` in the collapsed-stack format
+(``thread;outer;...;inner count``), which flamegraph.pl and speedscope
+read directly, next to ``<id>.json`` with the request details. The id is
+returned in the ``X-Profile-Id`` response header. Only the newest
+``max_files`` profiles are kept.
+"""
+
+import hmac
+import itertools
+import json
+import linecache
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import anyio
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+# Кадры, на которых поток простаивает: цикл событий в select, пулы потоков на очереди
+IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get")}
+# Рабочие циклы, которые ждут задачу в C-вызове queue.get (ThreadPoolExecutor, соединения aiosqlite):
+# простаивают, только пока стоят на строке с .get(, иначе C-вызов задачи не отличить от ожидания
+QUEUE_WORKERS = {("thread.py", "_worker"), ("core.py", "_connection_worker_thread")}
+
+
+def is_idle(frame) -> bool:
+    code = frame.f_code
+    key = (Path(code.co_filename).name, code.co_name)
+    if key in IDLE_FRAMES:
+        return True
+    return key in QUEUE_WORKERS and ".get(" in linecache.getline(code.co_filename, frame.f_lineno)
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ",")
+
+
+class StackSampler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self._record(names.get(ident, str(ident)), frame)
+            if self._stop.wait(self.interval):
+                return
+
+    def _record(self, thread_name: str, frame) -> None:
+        if is_idle(frame):
+            return
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        stack.append(thread_name.replace(";", ","))
+        self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileStore:
+    def __init__(self, directory: Path, max_files: int) -> None:
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, profile_id: str, samples: Counter, details: Dict[str, object]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        folded = "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+        (self.directory / f"{profile_id}.folded").write_text(folded, encoding="utf-8")
+        (self.directory / f"{profile_id}.json").write_text(
+            json.dumps({"id": profile_id, **details}, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        self._prune()
+
+    def _prune(self) -> None:
+        profiles = sorted(self.directory.glob("*.folded"), key=lambda path: path.stat().st_mtime)
+        for path in profiles[: max(0, len(profiles) - self.max_files)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app,
+        routes: List,
+        is_admin_token: Callable[[str], bool],
+        directory: Path,
+        token: str = "",
+        sample_every: int = 0,
+        interval: float = 0.005,
+        max_files: int = 200,
+    ) -> None:
+        self.app = app
+        self.routes = routes
+        self.is_admin_token = is_admin_token
+        self.store = ProfileStore(directory, max_files)
+        self.token = token.encode()
+        self.sample_every = sample_every
+        self.interval = interval
+        self._counters: Dict[str, "itertools.count[int]"] = {}
+        self._active = threading.Lock()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        reason = await self.profile_reason(scope)
+        if reason is None or not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]}
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # join ждёт, пока сэмплер дообойдёт стеки, — не на потоке цикла событий
+            samples = await anyio.to_thread.run_sync(sampler.stop)
+            self._active.release()
+            details = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": self.route_template(scope),
+                "status": status,
+                "reason": reason,
+                "duration_s": round(time.perf_counter() - started, 6),
+                "interval_s": self.interval,
+                "samples": sum(samples.values()),
+            }
+            try:
+                await anyio.to_thread.run_sync(self.store.save, profile_id, samples, details)
+            except OSError:
+                logger.exception("Failed to save profile %s", profile_id)
+
+    async def profile_reason(self, scope) -> Optional[str]:
+        """Why this request should be profiled ("token", "admin" or "sampled"), or None."""
+        headers = dict(scope["headers"])
+        requested = headers.get(PROFILE_HEADER)
+        if requested is not None:
+            if self.token and hmac.compare_digest(requested, self.token):
+                return "token"
+            scheme, _, credentials = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and credentials:
+                if await anyio.to_thread.run_sync(self.is_admin_token, credentials):
+                    return "admin"
+        if self.sample_every > 0:
+            counter = self._counters.setdefault(self.route_template(scope), itertools.count(1))
+            if next(counter) % self.sample_every == 0:
+                return "sampled"
+        return None
+
+    def route_template(self, scope) -> str:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "<unmatched>")
+        return "<unmatched>"
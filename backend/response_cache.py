@@ -0,0 +1,76 @@
+"""Pre-serialized JSON bodies for read-mostly endpoints.
+
+A payload is built and encoded once per data version (the same version
+functions that drive the ETags in ``http_cache``); later requests get the
+stored UTF-8 bytes without touching ``jsonable_encoder`` or the encoder.
+``respond_async`` serves a current body on the event loop and only moves
+the (file-reading) rebuild to a worker thread.
+"""
+
+import json
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+
+from http_cache import VersionFunc
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: object) -> object:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class SerializedResponses:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[str, bytes]] = {}
+
+    def body(self, key: str, version: VersionFunc, build: Callable[[], object]) -> bytes:
+        tag, _ = version()
+        with self._lock:
+            cached = self._bodies.get(key)
+        if cached is not None and cached[0] == tag:
+            return cached[1]
+        body = dumps(build())
+        with self._lock:
+            self._bodies[key] = (tag, body)
+        return body
+
+    def respond(self, key: str, version: VersionFunc, build: Callable[[], object]) -> Response:
+        return Response(content=self.body(key, version, build), media_type="application/json")
+
+    async def respond_async(
+        self,
+        key: str,
+        version: VersionFunc,
+        build: Callable[[], object],
+        limiter: Optional[anyio.CapacityLimiter] = None,
+    ) -> Response:
+        tag, _ = version()
+        with self._lock:
+            cached = self._bodies.get(key)
+        if cached is not None and cached[0] == tag:
+            body = cached[1]
+        else:
+            body = await anyio.to_thread.run_sync(self.body, key, version, build, limiter=limiter)
+        return Response(content=body, media_type="application/json")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
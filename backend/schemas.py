@@ -1,5 +1,9 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel, Field
 
+from config import PREDICT_MAX_ROWS
+
 
 class UserOut(BaseModel):
     id: int
@@ -11,6 +15,18 @@ class UserOut(BaseModel):
     }
 
 
+class TaskSummaryOut(BaseModel):
+    id: int
+    slug: str
+    title: str
+    short_description: str
+    task_number: int
+
+    model_config = {
+        "from_attributes": True,
+    }
+
+
 class TaskOut(BaseModel):
     id: int
     slug: str
@@ -29,6 +45,15 @@ class TaskOut(BaseModel):
     }
 
 
+class TaskSearchHit(BaseModel):
+    slug: str
+    title: str
+    task_number: int
+    score: float
+    # Фрагменты с подсветкой <mark>…</mark> по блокам, где найдены слова запроса
+    snippets: Dict[str, str]
+
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -69,3 +94,10 @@ class KpiSuzdalFeedbackForm(BaseModel):
     wait_time_minutes: int = Field(..., ge=0, le=240)
     satisfaction_score: int = Field(..., ge=1, le=10)
     comment: str | None = None
+
+
+class ScenarioBatchRequest(BaseModel):
+    """Scenario rows as a matrix; columns follow ``feature_names`` (model order by default)."""
+
+    rows: List[List[float]] = Field(..., min_length=1, max_length=PREDICT_MAX_ROWS)
+    feature_names: Optional[List[str]] = None
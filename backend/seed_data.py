@@ -1,18 +1,52 @@
+import hashlib
+import inspect
+import json
+import logging
 import math
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from statistics import mean
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
+from sqlalchemy import select
 
-from auth import get_password_hash
-from config import DATA_DIR, STATIC_DIR
+from columnar import mirror_data_dir
+from config import DATA_DIR, SEED_PARALLEL_MIN_ROWS, SEED_WORKERS, STATIC_DIR
+from data_versions import TASKS, bump_data_version
 from database import SessionLocal, init_db
+from import_forms import import_form_csvs
 from models import Task, User
+import synthetic_data
+from synthetic_data import (
+    AGE_MAX,
+    AGE_MIN,
+    DISTRICTS,
+    EMPLOYMENTS,
+    GENDERS,
+    IDEA_CATEGORIES,
+    IDEA_IMPACTS,
+    INTENT_LEAVE,
+    INTENT_LEAVE_SHARE,
+    INTENT_STAY,
+    ISSUE_TYPES,
+    PRIORITIES,
+    PRIORITY_WEIGHTS,
+    SCORE_MEAN,
+    SCORE_STD,
+    SENTIMENTS_NEGATIVE,
+    SENTIMENTS_POSITIVE,
+)
+from task_search import rebuild_search_index
 
-random.seed(42)
+logger = logging.getLogger(__name__)
+
+SEED = 42
+SEED_MANIFEST = DATA_DIR / "seed_manifest.json"
 
 
 def ensure_directories() -> None:
@@ -20,34 +54,28 @@ def ensure_directories() -> None:
     (STATIC_DIR / "img").mkdir(parents=True, exist_ok=True)
 
 
-def generate_monitoring_data() -> Dict[str, float]:
-    file_path = DATA_DIR / "monitoring_kostroma_responses.csv"
-    genders = ["Женщина", "Мужчина"]
-    employments = ["Госсектор", "Бизнес", "Социальная сфера", "ИТ", "Студент"]
-    sentiments_positive = [
-        "Ремонт дорог наконец-то почувствовался",
-        "Появилось больше культурных событий",
-        "Получаю поддержку от МФЦ",
-    ]
-    sentiments_negative = [
-        "Проблемы с транспортом сохраняются",
-        "С рабочими местами сложно",
-        "Сфера ЖКХ всё ещё отстаёт",
-    ]
+def monitoring_rows(rng: random.Random, count: int = 200) -> List[Dict[str, object]]:
     rows: List[Dict[str, object]] = []
-    for _ in range(200):
-        score = max(1, min(10, int(random.gauss(6.8, 1.6))))
-        comment = random.choice(sentiments_positive if score >= 7 else sentiments_negative)
+    for _ in range(count):
+        score = max(1, min(10, int(rng.gauss(SCORE_MEAN, SCORE_STD))))
+        comment = rng.choice(SENTIMENTS_POSITIVE if score >= 7 else SENTIMENTS_NEGATIVE)
         rows.append(
             {
-                "age": random.randint(18, 72),
-                "gender": random.choice(genders),
-                "employment_type": random.choice(employments),
+                "age": rng.randint(AGE_MIN, AGE_MAX),
+                "gender": rng.choice(GENDERS),
+                "employment_type": rng.choice(EMPLOYMENTS),
                 "life_quality_score": score,
-                "intent_to_leave": "Планирую уехать" if random.random() < 0.33 else "Останусь",
+                "intent_to_leave": INTENT_LEAVE if rng.random() < INTENT_LEAVE_SHARE else INTENT_STAY,
                 "comment": comment,
             }
         )
+    return rows
+
+
+def generate_monitoring_data(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, float]:
+    file_path = DATA_DIR / "monitoring_kostroma_responses.csv"
+    if rows is None:
+        rows = monitoring_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
     avg_score = round(df["life_quality_score"].mean(), 1)
@@ -59,22 +87,25 @@ def generate_monitoring_data() -> Dict[str, float]:
     return {"avg_score": avg_score, "intent_share": intent_share, "positive_share": positive_share}
 
 
-def generate_crowdsourcing_data() -> Dict[str, object]:
-    file_path = DATA_DIR / "crowdsourcing_roads_responses.csv"
-    districts = ["Центральный", "Заволжский", "Первомайский", "Северный", "Южный"]
-    issue_types = ["Ямы во дворах", "Снег и наледь", "Неравномерное освещение", "Плохой тротуар", "Парковочные карманы"]
-    priorities = ["Низкий", "Средний", "Высокий"]
+def crowdsourcing_rows(rng: random.Random, count: int = 110) -> List[Dict[str, object]]:
     rows = []
-    for _ in range(110):
-        issue = random.choice(issue_types)
+    for _ in range(count):
+        issue = rng.choice(ISSUE_TYPES)
         rows.append(
             {
-                "district": random.choice(districts),
+                "district": rng.choice(DISTRICTS),
                 "issue_type": issue,
                 "description": f"Заявка пользователя: {issue.lower()}",
-                "priority": random.choices(priorities, weights=[0.2, 0.5, 0.3])[0],
+                "priority": rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0],
             }
         )
+    return rows
+
+
+def generate_crowdsourcing_data(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    file_path = DATA_DIR / "crowdsourcing_roads_responses.csv"
+    if rows is None:
+        rows = crowdsourcing_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
     issue_leader = df["issue_type"].value_counts().idxmax()
@@ -82,30 +113,25 @@ def generate_crowdsourcing_data() -> Dict[str, object]:
     return {"top_issue": issue_leader, "top_district": busiest_district, "total": len(df)}
 
 
-def generate_nn_ideas() -> Dict[str, object]:
-    file_path = DATA_DIR / "nn_gorod_idey_ideas.csv"
-    categories = [
-        "Городская среда",
-        "Транспорт",
-        "Культура",
-        "Экология",
-        "Цифровые сервисы",
-    ]
+def nn_idea_rows(rng: random.Random, count: int = 45) -> List[Dict[str, object]]:
     rows = []
-    for idx in range(45):
-        category = random.choice(categories)
+    for idx in range(count):
+        category = rng.choice(IDEA_CATEGORIES)
         rows.append(
             {
                 "category": category,
                 "title": f"Идея #{idx + 1}",
                 "description": f"Прототип изменения для категории {category.lower()}.",
-                "expected_impact": random.choice([
-                    "Рост вовлечённости жителей на 15%",
-                    "Экономия бюджета до 8 млн ₽",
-                    "Сокращение времени услуги на 20%",
-                ]),
+                "expected_impact": rng.choice(IDEA_IMPACTS),
             }
         )
+    return rows
+
+
+def generate_nn_ideas(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    file_path = DATA_DIR / "nn_gorod_idey_ideas.csv"
+    if rows is None:
+        rows = nn_idea_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
     top_category = df["category"].value_counts().idxmax()
@@ -113,8 +139,7 @@ def generate_nn_ideas() -> Dict[str, object]:
     return {"top_category": top_category, "digital_share": innovation_share, "total": len(df)}
 
 
-def generate_kpi_data() -> Dict[str, object]:
-    file_path = DATA_DIR / "kpi_suzdal_monthly.csv"
+def kpi_rows(rng: random.Random) -> List[Dict[str, object]]:
     months = [
         "2024-01",
         "2024-02",
@@ -134,9 +159,9 @@ def generate_kpi_data() -> Dict[str, object]:
     for month in months:
         month_idx = int(month.split("-")[1])
         seasonal_multiplier = 1.3 if month_idx in (6, 7, 8) else 0.9 if month_idx in (1, 2) else 1
-        visits = int(base_visits * seasonal_multiplier + random.randint(-120, 120))
-        conversion = round(0.32 + (seasonal_multiplier - 1) * 0.05 + random.uniform(-0.02, 0.02), 3)
-        satisfaction = round(4.4 + (seasonal_multiplier - 1) * 0.3 + random.uniform(-0.2, 0.2), 1)
+        visits = int(base_visits * seasonal_multiplier + rng.randint(-120, 120))
+        conversion = round(0.32 + (seasonal_multiplier - 1) * 0.05 + rng.uniform(-0.02, 0.02), 3)
+        satisfaction = round(4.4 + (seasonal_multiplier - 1) * 0.3 + rng.uniform(-0.2, 0.2), 1)
         rows.append(
             {
                 "month": month,
@@ -145,6 +170,13 @@ def generate_kpi_data() -> Dict[str, object]:
                 "satisfaction_score": satisfaction,
             }
         )
+    return rows
+
+
+def generate_kpi_data(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    file_path = DATA_DIR / "kpi_suzdal_monthly.csv"
+    if rows is None:
+        rows = kpi_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
     best_month = df.sort_values("conversion_rate", ascending=False).iloc[0]["month"]
@@ -156,8 +188,7 @@ def generate_kpi_data() -> Dict[str, object]:
     return {"best_month": best_month, "summer_uplift": summer_uplift}
 
 
-def generate_digital_inequality() -> Dict[str, object]:
-    file_path = DATA_DIR / "digital_inequality_regions.csv"
+def digital_inequality_rows(rng: random.Random) -> List[Dict[str, object]]:
     regions = [
         "Костромская область",
         "Воронежская область",
@@ -177,10 +208,10 @@ def generate_digital_inequality() -> Dict[str, object]:
     ]
     rows = []
     for region in regions:
-        gdp = random.randint(450, 1150)
-        internet = random.randint(68, 94)
-        rural_share = random.randint(15, 42)
-        inequality = round(80 - (gdp / 20) - (internet * 0.4) + rural_share * 0.6 + random.uniform(-4, 4), 2)
+        gdp = rng.randint(450, 1150)
+        internet = rng.randint(68, 94)
+        rural_share = rng.randint(15, 42)
+        inequality = round(80 - (gdp / 20) - (internet * 0.4) + rural_share * 0.6 + rng.uniform(-4, 4), 2)
         rows.append(
             {
                 "region": region,
@@ -190,8 +221,19 @@ def generate_digital_inequality() -> Dict[str, object]:
                 "digital_inequality_index": max(5, min(inequality, 60)),
             }
         )
+    return rows
+
+
+def generate_digital_inequality(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    file_path = DATA_DIR / "digital_inequality_regions.csv"
+    if rows is None:
+        rows = digital_inequality_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
+    # sklearn нужен только при сидировании, а модуль импортируют и обработчики API
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error
+
     X = df[["gdp_per_capita", "internet_penetration", "rural_share"]]
     y = df["digital_inequality_index"]
     model = LinearRegression().fit(X, y)
@@ -209,14 +251,13 @@ def generate_digital_inequality() -> Dict[str, object]:
     }
 
 
-def generate_aircraft_program_data() -> Dict[str, object]:
-    file_path = DATA_DIR / "aircraft_program_kpi.csv"
+def aircraft_program_rows(rng: random.Random) -> List[Dict[str, object]]:
     rows = []
     for year in range(2018, 2025):
-        budget = random.randint(180, 290)
-        aircraft = random.randint(35, 70)
-        localization = round(random.uniform(58, 81), 1)
-        innovation = round(random.uniform(0.55, 0.78), 2)
+        budget = rng.randint(180, 290)
+        aircraft = rng.randint(35, 70)
+        localization = round(rng.uniform(58, 81), 1)
+        innovation = round(rng.uniform(0.55, 0.78), 2)
         rows.append(
             {
                 "year": year,
@@ -226,6 +267,13 @@ def generate_aircraft_program_data() -> Dict[str, object]:
                 "innovation_index": innovation,
             }
         )
+    return rows
+
+
+def generate_aircraft_program_data(rows: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    file_path = DATA_DIR / "aircraft_program_kpi.csv"
+    if rows is None:
+        rows = aircraft_program_rows(random.Random(SEED))
     df = pd.DataFrame(rows)
     df.to_csv(file_path, index=False)
     efficiency = round((df["aircraft_delivered"].sum() / df["budget_spent"].sum()) * 100, 1)
@@ -923,52 +971,231 @@ def build_tasks_payload(stats: Dict[str, Dict[str, float]]) -> List[Dict[str, ob
 
 
 def seed_admin(db_session) -> None:
+    from auth import get_password_hash, revoke_user_tokens, verify_password
+
     user = db_session.query(User).filter(User.username == "admin").first()
-    hashed = get_password_hash("admin123")
     if user:
-        user.hashed_password = hashed
-        user.is_admin = True
+        if not user.is_admin or not verify_password("admin123", user.hashed_password):
+            user.hashed_password = get_password_hash("admin123")
+            user.is_admin = True
+            # Пароль или права сброшены — ранее выданные токены больше не действуют
+            revoke_user_tokens(db_session, user)
     else:
-        db_session.add(User(username="admin", hashed_password=hashed, is_admin=True))
+        db_session.add(User(username="admin", hashed_password=get_password_hash("admin123"), is_admin=True))
     db_session.commit()
 
 
-def seed_tasks(db_session, stats: Dict[str, Dict[str, float]]) -> None:
-    tasks_payload = build_tasks_payload(stats)
-    for task_data in tasks_payload:
-        existing = db_session.query(Task).filter(Task.slug == task_data["slug"]).first()
-        if existing:
-            for key, value in task_data.items():
-                setattr(existing, key, value)
+def task_content_hash(task_data: Dict[str, object]) -> str:
+    payload = json.dumps(task_data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def upsert_statement(dialect_name: str, rows: List[Dict[str, object]]):
+    """``INSERT ... ON CONFLICT(slug) DO UPDATE`` for all content columns of ``rows``."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(Task).values(rows)
+    columns = [name for name in rows[0] if name != "slug"]
+    return statement.on_conflict_do_update(
+        index_elements=[Task.slug],
+        set_={name: statement.excluded[name] for name in columns},
+    )
+
+
+def seed_tasks(db_session, stats: Dict[str, Dict[str, float]]) -> Dict[str, int]:
+    """Write tasks whose content changed in one upsert; returns inserted/updated/unchanged counts.
+
+    Untouched rows are not rewritten, so a repeated seed neither grows the WAL
+    nor invalidates task caches.
+    """
+    stored = dict(db_session.execute(select(Task.slug, Task.content_hash)).all())
+    changed: List[Dict[str, object]] = []
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for task_data in build_tasks_payload(stats):
+        content_hash = task_content_hash(task_data)
+        if task_data["slug"] not in stored:
+            counts["inserted"] += 1
+        elif stored[task_data["slug"]] != content_hash:
+            counts["updated"] += 1
         else:
-            db_session.add(Task(**task_data))
+            counts["unchanged"] += 1
+            continue
+        changed.append({**task_data, "content_hash": content_hash})
+
+    if changed:
+        db_session.execute(upsert_statement(db_session.get_bind().dialect.name, changed))
+        rebuild_search_index(db_session)
+        bump_data_version(db_session, TASKS)
     db_session.commit()
+    logger.info("Tasks: %(inserted)d inserted, %(updated)d updated, %(unchanged)d unchanged", counts)
+    return counts
+
+
+@lru_cache(maxsize=None)
+def synthetic_data_source() -> str:
+    return inspect.getsource(synthetic_data)
+
+
+@dataclass(frozen=True)
+class SeedJob:
+    """One generated dataset: the stats key, its output files and how to build them.
+
+    ``draw`` consumes the shared random stream and returns the rows;
+    ``generate`` writes the files from them and returns the stats.
+    Generators without randomness have no ``draw``.
+    """
+
+    name: str
+    generate: Callable[..., Dict[str, object]]
+    files: Tuple[str, ...]
+    draw: Optional[Callable[..., List[Dict[str, object]]]] = None
+    params: Dict[str, object] = field(default_factory=dict)
+
+    def code_version(self) -> str:
+        source = "".join(inspect.getsource(func) for func in (self.draw, self.generate) if func is not None)
+        if self.draw is not None:
+            # категории и параметры распределений живут в synthetic_data, поэтому его исходник тоже входит в версию
+            source += synthetic_data_source()
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+# Порядок важен: draw-функции по очереди читают один поток random.Random(SEED),
+# поэтому данные совпадают с прежним последовательным запуском
+SEED_JOBS: Tuple[SeedJob, ...] = (
+    SeedJob("monitoring_kostroma", generate_monitoring_data, ("monitoring_kostroma_responses.csv",), monitoring_rows, {"count": 200}),
+    SeedJob("crowdsourcing_roads", generate_crowdsourcing_data, ("crowdsourcing_roads_responses.csv",), crowdsourcing_rows, {"count": 110}),
+    SeedJob("nn_gorod_idey", generate_nn_ideas, ("nn_gorod_idey_ideas.csv",), nn_idea_rows, {"count": 45}),
+    SeedJob("kpi_suzdal", generate_kpi_data, ("kpi_suzdal_monthly.csv",), kpi_rows),
+    SeedJob("digital_inequality", generate_digital_inequality, ("digital_inequality_regions.csv",), digital_inequality_rows),
+    SeedJob("aircraft_program", generate_aircraft_program_data, ("aircraft_program_kpi.csv",), aircraft_program_rows),
+    SeedJob(
+        "healthcare_nekrasovka",
+        generate_healthcare_data,
+        ("healthcare_nekrasovka_points.csv", "healthcare_nekrasovka_population.csv"),
+    ),
+    SeedJob("digital_services_law", generate_digital_services_summary, ("digital_services_law_summary.csv",)),
+)
+SEED_JOBS_BY_NAME = {job.name: job for job in SEED_JOBS}
+
+STATIC_STATS: Dict[str, Dict[str, float]] = {
+    "digital_participation": {"success_rate": 0.55, "engagement_score": 7.2},
+    "digital_identity": {"security_score": 8.7, "usability_score": 7.5},
+    "smart_cities": {"maturity_index": 65.3, "efficiency_gain": 0.22},
+    "govtech_innovation": {"startup_success_rate": 0.63, "implementation_speed": 0.8},
+    "digital_skills": {"literacy_rate": 0.67, "training_effectiveness": 0.71},
+    "open_data": {"utilization_rate": 0.45, "quality_score": 7.8},
+    "digital_ethics": {"compliance_rate": 0.68, "ethics_incidents": 0.12},
+}
+
+
+def fingerprint(job: SeedJob, rng_state: object) -> str:
+    """Identify a dataset build by generator code, parameters and the random state it starts from."""
+    payload = {
+        "code": job.code_version(),
+        "params": job.params,
+        "seed": SEED,
+        "state": hashlib.sha256(repr(rng_state).encode("utf-8")).hexdigest() if job.draw else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def file_digest(path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_manifest() -> Dict[str, Dict[str, object]]:
+    try:
+        return json.loads(SEED_MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict[str, object]]) -> None:
+    tmp_path = SEED_MANIFEST.with_suffix(".tmp")
+    # статистика содержит numpy-скаляры
+    tmp_path.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True, default=lambda value: value.item()),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, SEED_MANIFEST)
+
+
+def is_current(entry: Optional[Dict[str, object]], job: SeedJob, job_fingerprint: str) -> bool:
+    if not entry or entry.get("fingerprint") != job_fingerprint:
+        return False
+    files = entry.get("files") or {}
+    return all(files.get(name) and files[name] == file_digest(DATA_DIR / name) for name in job.files)
+
+
+def run_seed_job(name: str, rows: Optional[List[Dict[str, object]]]) -> Dict[str, object]:
+    """Process pool entry point: write one dataset and return its stats."""
+    job = SEED_JOBS_BY_NAME[name]
+    return job.generate(rows) if job.draw else job.generate()
+
+
+def generate_datasets(workers: int = SEED_WORKERS, force: bool = False) -> Dict[str, Dict[str, object]]:
+    """Build the generated datasets, skipping those whose fingerprint and files are unchanged.
+
+    Rows are drawn here, in the original order from one ``random.Random(SEED)``,
+    so each dataset gets the same numbers as a sequential run; writing the files
+    and computing the stats runs in a process pool once there are enough rows to
+    pay for starting the workers (each imports pandas again).
+    """
+    started = time.perf_counter()
+    manifest = load_manifest()
+    rng = random.Random(SEED)
+    pending: Dict[str, Tuple[str, Optional[List[Dict[str, object]]]]] = {}
+    stats: Dict[str, Dict[str, object]] = {}
+    for job in SEED_JOBS:
+        job_fingerprint = fingerprint(job, rng.getstate())
+        rows = job.draw(rng, **job.params) if job.draw else None
+        entry = manifest.get(job.name)
+        if not force and is_current(entry, job, job_fingerprint):
+            stats[job.name] = entry["stats"]
+        else:
+            pending[job.name] = (job_fingerprint, rows)
+
+    pending_rows = sum(len(rows) for _, rows in pending.values() if rows)
+    if len(pending) > 1 and workers > 1 and pending_rows >= SEED_PARALLEL_MIN_ROWS:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {name: pool.submit(run_seed_job, name, rows) for name, (_, rows) in pending.items()}
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: run_seed_job(name, rows) for name, (_, rows) in pending.items()}
+
+    for name, (job_fingerprint, _) in pending.items():
+        stats[name] = results[name]
+        manifest[name] = {
+            "fingerprint": job_fingerprint,
+            "files": {file_name: file_digest(DATA_DIR / file_name) for file_name in SEED_JOBS_BY_NAME[name].files},
+            "stats": results[name],
+        }
+    if pending:
+        save_manifest(manifest)
+    logger.info(
+        "Datasets: %d generated, %d unchanged in %.2fs",
+        len(pending),
+        len(SEED_JOBS) - len(pending),
+        time.perf_counter() - started,
+    )
+    return {job.name: stats[job.name] for job in SEED_JOBS}
 
 
 def init_db_and_seed() -> None:
     ensure_directories()
-    stats = {
-        "monitoring_kostroma": generate_monitoring_data(),
-        "crowdsourcing_roads": generate_crowdsourcing_data(),
-        "nn_gorod_idey": generate_nn_ideas(),
-        "kpi_suzdal": generate_kpi_data(),
-        "digital_inequality": generate_digital_inequality(),
-        "aircraft_program": generate_aircraft_program_data(),
-        "healthcare_nekrasovka": generate_healthcare_data(),
-        "digital_services_law": generate_digital_services_summary(),
-        "digital_participation": {"success_rate": 0.55, "engagement_score": 7.2},
-        "digital_identity": {"security_score": 8.7, "usability_score": 7.5},
-        "smart_cities": {"maturity_index": 65.3, "efficiency_gain": 0.22},
-        "govtech_innovation": {"startup_success_rate": 0.63, "implementation_speed": 0.8},
-        "digital_skills": {"literacy_rate": 0.67, "training_effectiveness": 0.71},
-        "open_data": {"utilization_rate": 0.45, "quality_score": 7.8},
-        "digital_ethics": {"compliance_rate": 0.68, "ethics_incidents": 0.12},
-    }
+    stats = {**generate_datasets(), **STATIC_STATS}
+    mirror_data_dir(DATA_DIR)
     init_db()
     db = SessionLocal()
     try:
         seed_admin(db)
         seed_tasks(db, stats)
+        import_form_csvs(db)
     finally:
         db.close()
 
@@ -0,0 +1,95 @@
+"""Startup profile for the API: per-module import time and memory of `import main`.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter, prints
+the slowest modules (cumulative and self time) and exits with status 1 when
+the import exceeds the time or peak-RSS budget, or pulls in a module that
+must stay lazy. Usable as a CI check:
+
+    python startup_profile.py --max-seconds 1.5 --max-rss-mb 150
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from config import STARTUP_IMPORT_BUDGET_S, STARTUP_RSS_BUDGET_MB
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Модули, которые не должны загружаться при импорте main (грузятся лениво или в warm-up)
+LAZY_MODULES = ("pandas", "sklearn", "matplotlib", "seed_data", "passlib")
+
+CHILD_CODE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+seconds = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print(json.dumps({"seconds": seconds, "rss_mb": rss_mb, "modules": sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for each line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def profile_import() -> Tuple[Dict[str, object], List[Tuple[str, int, int]]]:
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"`import main` failed:\n{result.stderr[-4000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20, help="number of modules to list")
+    parser.add_argument("--max-seconds", type=float, default=STARTUP_IMPORT_BUDGET_S)
+    parser.add_argument("--max-rss-mb", type=float, default=STARTUP_RSS_BUDGET_MB)
+    parser.add_argument("--allow", action="append", default=[], help="lazy module allowed at import time")
+    args = parser.parse_args()
+
+    summary, entries = profile_import()
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda entry: entry[2], reverse=True)[: args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+    print(f"\nimport main: {summary['seconds']:.3f}s (budget {args.max_seconds:.3f}s), "
+          f"peak RSS {summary['rss_mb']:.1f} MB (budget {args.max_rss_mb:.1f} MB)")
+
+    failures = []
+    if summary["seconds"] > args.max_seconds:
+        failures.append(f"import time {summary['seconds']:.3f}s exceeds {args.max_seconds:.3f}s")
+    if summary["rss_mb"] > args.max_rss_mb:
+        failures.append(f"peak RSS {summary['rss_mb']:.1f} MB exceeds {args.max_rss_mb:.1f} MB")
+    loaded = set(summary["modules"])
+    eager = [name for name in LAZY_MODULES if name in loaded and name not in args.allow]
+    if eager:
+        failures.append(f"modules expected to load lazily were imported: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Large synthetic datasets for load-testing the data endpoints.
+
+Produces the same CSV layouts and distributions as the seed generators in
+``seed_data`` at any row count, with vectorized NumPy sampling. Every
+column draws from its own child generator of ``SeedSequence(seed)``, so
+the output depends only on the seed and the row count, not on the chunk
+size.
+
+Rows are streamed to disk in chunks. All columns are categorical (or
+derived from one), so each chunk is rendered by looking its rows up in
+a table of pre-formatted CSV fragments indexed by the column codes;
+only running row numbers are formatted per row. This is about twenty
+times faster than ``DataFrame.to_csv``.
+
+    python synthetic_data.py monitoring_kostroma --rows 10000000 --out /tmp/monitoring.csv
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import DATA_DIR
+
+GENDERS = ("Женщина", "Мужчина")
+EMPLOYMENTS = ("Госсектор", "Бизнес", "Социальная сфера", "ИТ", "Студент")
+SENTIMENTS_POSITIVE = (
+    "Ремонт дорог наконец-то почувствовался",
+    "Появилось больше культурных событий",
+    "Получаю поддержку от МФЦ",
+)
+SENTIMENTS_NEGATIVE = (
+    "Проблемы с транспортом сохраняются",
+    "С рабочими местами сложно",
+    "Сфера ЖКХ всё ещё отстаёт",
+)
+INTENT_LEAVE = "Планирую уехать"
+INTENT_STAY = "Останусь"
+INTENT_LEAVE_SHARE = 0.33
+SCORE_MEAN, SCORE_STD = 6.8, 1.6
+AGE_MIN, AGE_MAX = 18, 72
+
+DISTRICTS = ("Центральный", "Заволжский", "Первомайский", "Северный", "Южный")
+ISSUE_TYPES = ("Ямы во дворах", "Снег и наледь", "Неравномерное освещение", "Плохой тротуар", "Парковочные карманы")
+PRIORITIES = ("Низкий", "Средний", "Высокий")
+PRIORITY_WEIGHTS = (0.2, 0.5, 0.3)
+
+IDEA_CATEGORIES = ("Городская среда", "Транспорт", "Культура", "Экология", "Цифровые сервисы")
+IDEA_IMPACTS = (
+    "Рост вовлечённости жителей на 15%",
+    "Экономия бюджета до 8 млн ₽",
+    "Сокращение времени услуги на 20%",
+)
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+# Больше строк в таблице фрагментов — дольше её построение, чем выигрыш
+MAX_TABLE_SIZE = 1_000_000
+
+Codes = np.ndarray
+Sampler = Callable[[np.random.Generator, int, Dict[str, Codes]], Codes]
+
+
+@dataclass(frozen=True)
+class Column:
+    """A CSV column: rendered ``values`` and a sampler returning indexes into them.
+
+    A column with ``source`` reuses that column's codes (e.g. a description
+    derived from the issue type); a column without ``values`` is the 1-based
+    row number rendered through ``template``.
+    """
+
+    name: str
+    values: Optional[Tuple[str, ...]] = None
+    sample: Optional[Sampler] = None
+    source: Optional[str] = None
+    template: str = "{}"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    file_name: str
+    columns: Tuple[Column, ...]
+
+
+def csv_field(value: str) -> str:
+    if any(char in value for char in ',"\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def uniform(count: int) -> Sampler:
+    return lambda rng, size, drawn: rng.integers(0, count, size)
+
+
+def sample_score(rng: np.random.Generator, size: int, drawn: Dict[str, Codes]) -> Codes:
+    # как max(1, min(10, int(random.gauss(...)))): int() отбрасывает дробную часть
+    return np.clip(np.trunc(rng.normal(SCORE_MEAN, SCORE_STD, size)), 1, 10).astype(np.int64) - 1
+
+
+def sample_comment(rng: np.random.Generator, size: int, drawn: Dict[str, Codes]) -> Codes:
+    positive = drawn["life_quality_score"] >= 6  # код 6 — оценка 7
+    return rng.integers(0, len(SENTIMENTS_POSITIVE), size) + np.where(positive, 0, len(SENTIMENTS_POSITIVE))
+
+
+def sample_intent(rng: np.random.Generator, size: int, drawn: Dict[str, Codes]) -> Codes:
+    return (rng.random(size) >= INTENT_LEAVE_SHARE).astype(np.int64)
+
+
+def sample_priority(rng: np.random.Generator, size: int, drawn: Dict[str, Codes]) -> Codes:
+    return rng.choice(len(PRIORITIES), size, p=PRIORITY_WEIGHTS)
+
+
+DATASETS: Dict[str, Dataset] = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset(
+            "monitoring_kostroma",
+            "monitoring_kostroma_responses.csv",
+            (
+                Column("age", tuple(str(age) for age in range(AGE_MIN, AGE_MAX + 1)), uniform(AGE_MAX - AGE_MIN + 1)),
+                Column("gender", GENDERS, uniform(len(GENDERS))),
+                Column("employment_type", EMPLOYMENTS, uniform(len(EMPLOYMENTS))),
+                Column("life_quality_score", tuple(str(score) for score in range(1, 11)), sample_score),
+                Column("intent_to_leave", (INTENT_LEAVE, INTENT_STAY), sample_intent),
+                Column("comment", SENTIMENTS_POSITIVE + SENTIMENTS_NEGATIVE, sample_comment),
+            ),
+        ),
+        Dataset(
+            "crowdsourcing_roads",
+            "crowdsourcing_roads_responses.csv",
+            (
+                Column("district", DISTRICTS, uniform(len(DISTRICTS))),
+                Column("issue_type", ISSUE_TYPES, uniform(len(ISSUE_TYPES))),
+                Column(
+                    "description",
+                    tuple(f"Заявка пользователя: {issue.lower()}" for issue in ISSUE_TYPES),
+                    source="issue_type",
+                ),
+                Column("priority", PRIORITIES, sample_priority),
+            ),
+        ),
+        Dataset(
+            "nn_gorod_idey",
+            "nn_gorod_idey_ideas.csv",
+            (
+                Column("category", IDEA_CATEGORIES, uniform(len(IDEA_CATEGORIES))),
+                Column("title", template="Идея #{}"),
+                Column(
+                    "description",
+                    tuple(f"Прототип изменения для категории {category.lower()}." for category in IDEA_CATEGORIES),
+                    source="category",
+                ),
+                Column("expected_impact", IDEA_IMPACTS, uniform(len(IDEA_IMPACTS))),
+            ),
+        ),
+    )
+}
+
+
+class Segment:
+    """Consecutive categorical columns rendered together through one lookup table.
+
+    The table holds every combination of the codes the columns depend on,
+    already joined into a CSV fragment with the surrounding separators.
+    """
+
+    def __init__(self, columns: Sequence[Column], by_name: Dict[str, Column], prefix: str, suffix: str) -> None:
+        self.keys = list(dict.fromkeys(column.source or column.name for column in columns))
+        self.sizes = [len(by_name[key].values) for key in self.keys]
+        if int(np.prod(self.sizes)) > MAX_TABLE_SIZE:
+            raise ValueError("Too many value combinations for a lookup table")
+        table = []
+        for combination in itertools.product(*(range(size) for size in self.sizes)):
+            codes = dict(zip(self.keys, combination))
+            fields = [csv_field(column.values[codes[column.source or column.name]]) for column in columns]
+            table.append(prefix + ",".join(fields) + suffix)
+        self.table = np.array(table, dtype=object)
+
+    def render(self, start: int, drawn: Dict[str, Codes]) -> np.ndarray:
+        index = np.zeros(len(drawn[self.keys[0]]), dtype=np.int64)
+        for key, size in zip(self.keys, self.sizes):
+            index = index * size + drawn[key]
+        return self.table[index]
+
+
+class RowNumber:
+    def __init__(self, column: Column, prefix: str, suffix: str) -> None:
+        before, after = column.template.split("{}")
+        self.prefix = prefix + before
+        self.suffix = after + suffix
+
+    def render(self, start: int, drawn: Dict[str, Codes]) -> np.ndarray:
+        size = len(next(iter(drawn.values())))
+        return self.prefix + np.arange(start + 1, start + size + 1).astype(str).astype(object) + self.suffix
+
+
+class DatasetWriter:
+    def __init__(self, dataset: Dataset, seed: int) -> None:
+        self.dataset = dataset
+        sampled = [column for column in dataset.columns if column.sample is not None]
+        generators = map(np.random.default_rng, np.random.SeedSequence(seed).spawn(len(sampled)))
+        self.rngs = dict(zip((column.name for column in sampled), generators))
+
+        # соседние категориальные колонки рендерятся одной таблицей, номер строки — отдельно
+        groups = [list(group) for _, group in itertools.groupby(dataset.columns, key=lambda column: column.values is None)]
+        by_name = {column.name: column for column in dataset.columns}
+        self.pieces: List[object] = []
+        for position, group in enumerate(groups):
+            prefix = "," if position else ""
+            suffix = "\n" if position == len(groups) - 1 else ""
+            if group[0].values is None:
+                self.pieces.extend(RowNumber(column, prefix if index == 0 else ",", suffix) for index, column in enumerate(group))
+            else:
+                self.pieces.append(Segment(group, by_name, prefix, suffix))
+
+    def header(self) -> str:
+        return ",".join(csv_field(column.name) for column in self.dataset.columns) + "\n"
+
+    def chunk(self, start: int, size: int) -> str:
+        drawn: Dict[str, Codes] = {}
+        for column in self.dataset.columns:
+            if column.sample is not None:
+                drawn[column.name] = column.sample(self.rngs[column.name], size, drawn)
+        lines = self.pieces[0].render(start, drawn)
+        for piece in self.pieces[1:]:
+            lines = lines + piece.render(start, drawn)
+        return "".join(lines.tolist())
+
+
+def write_dataset(name: str, path: Path, rows: int, seed: int = 42, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write ``rows`` rows of dataset ``name`` to ``path`` chunk by chunk; returns the bytes written."""
+    writer = DatasetWriter(DATASETS[name], seed)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    written = 0
+    with open(tmp_path, "wb") as output:
+        written += output.write(writer.header().encode("utf-8"))
+        for start in range(0, rows, chunk_size):
+            written += output.write(writer.chunk(start, min(chunk_size, rows - start)).encode("utf-8"))
+    tmp_path.replace(path)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--out", type=Path, help="output CSV (default: the dataset's file in DATA_DIR)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    path = args.out or DATA_DIR / DATASETS[args.dataset].file_name
+    started = time.perf_counter()
+    write_dataset(args.dataset, path, args.rows, args.seed, args.chunk_size)
+    print(f"{path}: {args.rows} rows in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Cached task payloads keyed by the ``tasks`` data version.
+
+The dashboard list is built from a column-only query (no ``Text`` blocks)
+once per version of the tasks table; pages are slices of that list,
+addressed by a ``"<task_number>:<id>"`` keyset cursor, and their JSON is
+encoded once. Single tasks are cached per slug as encoded ``TaskOut`` and
+reloaded one by one when the version moves. ``seed_tasks`` bumps the
+version; a session is only opened on a miss.
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models import Task
+from response_cache import dumps
+from schemas import TaskOut, TaskSummaryOut
+
+SUMMARY_COLUMNS = (Task.id, Task.slug, Task.title, Task.short_description, Task.task_number)
+MAX_CACHED_PAGES = 256
+
+SortKey = Tuple[int, int]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[SortKey]:
+    if cursor is None:
+        return None
+    try:
+        task_number, task_id = cursor.split(":")
+        return int(task_number), int(task_id)
+    except ValueError as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def format_cursor(item: Dict[str, object]) -> str:
+    return f"{item['task_number']}:{item['id']}"
+
+
+class TaskSummaries:
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._tag: Optional[str] = None
+        self._items: List[Dict[str, object]] = []
+        self._keys: List[SortKey] = []
+        self._pages: Dict[Tuple[Optional[SortKey], int], Tuple[bytes, Optional[str]]] = {}
+
+    async def _load(self, tag: str) -> None:
+        async with self._session_factory() as db:
+            result = await db.execute(select(*SUMMARY_COLUMNS).order_by(Task.task_number, Task.id))
+        items = [TaskSummaryOut.model_validate(row).model_dump() for row in result.mappings()]
+        with self._lock:
+            self._tag = tag
+            self._items = items
+            self._keys = [(item["task_number"], item["id"]) for item in items]
+            self._pages = {}
+
+    async def page(self, tag: str, cursor: Optional[str], limit: int) -> Tuple[bytes, Optional[str]]:
+        """Return the encoded page after ``cursor`` and the cursor of the next page (None on the last)."""
+        after = parse_cursor(cursor)
+        if self._tag != tag:
+            await self._load(tag)
+        with self._lock:
+            cached = self._pages.get((after, limit))
+            if cached is not None:
+                return cached
+            start = bisect_right(self._keys, after) if after is not None else 0
+            items = self._items[start:start + limit]
+            more = start + limit < len(self._items)
+        page = (dumps(items), format_cursor(items[-1]) if more and items else None)
+        with self._lock:
+            if self._tag == tag:
+                if len(self._pages) >= MAX_CACHED_PAGES:
+                    self._pages.clear()
+                self._pages[(after, limit)] = page
+        return page
+
+
+class TaskDetails:
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[str, bytes]] = {}
+
+    async def get(self, tag: str, slug: str) -> Optional[bytes]:
+        """Encoded ``TaskOut`` for ``slug`` at version ``tag``; None if there is no such task."""
+        with self._lock:
+            cached = self._bodies.get(slug)
+        if cached is not None and cached[0] == tag:
+            return cached[1]
+        async with self._session_factory() as db:
+            task = (await db.scalars(select(Task).where(Task.slug == slug).limit(1))).first()
+            if task is None:
+                with self._lock:
+                    self._bodies.pop(slug, None)
+                return None
+            body = dumps(TaskOut.model_validate(task).model_dump())
+        with self._lock:
+            self._bodies[slug] = (tag, body)
+        return body
@@ -0,0 +1,116 @@
+"""Full-text search over task content (SQLite FTS5).
+
+``tasks_fts`` is an external-content FTS5 index over the text columns of
+``tasks``; ``seed_tasks`` rebuilds it in the same transaction that changes
+the tasks. The ``unicode61`` tokenizer case-folds Cyrillic; query terms
+lose a common Russian inflection ending and are matched as prefixes, so
+"цифровое неравенство" also finds "цифрового неравенства" without a
+stemmer in the index. Results are ranked with BM25, weighting the title
+highest.
+"""
+
+import re
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "tasks_fts"
+
+# (column, BM25 weight); the order is the column order of the FTS table
+SEARCH_COLUMNS = (
+    ("title", 10.0),
+    ("short_description", 5.0),
+    ("theory_block", 1.0),
+    ("methodology_block", 1.0),
+    ("data_block", 1.0),
+    ("results_block", 1.0),
+    ("conclusion_block", 1.0),
+    ("links_block", 0.5),
+)
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+MAX_QUERY_TERMS = 8
+
+CREATE_FTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    + ", ".join(name for name, _ in SEARCH_COLUMNS)
+    + ", content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+_columns = ", ".join(
+    f"snippet({FTS_TABLE}, {index}, '{HIGHLIGHT_OPEN}', '{HIGHLIGHT_CLOSE}', '…', {SNIPPET_TOKENS}) AS {name}"
+    for index, (name, _) in enumerate(SEARCH_COLUMNS)
+)
+_weights = ", ".join(str(weight) for _, weight in SEARCH_COLUMNS)
+SEARCH_QUERY = text(
+    f"SELECT tasks.slug, tasks.title AS task_title, tasks.task_number, bm25({FTS_TABLE}, {_weights}) AS score, {_columns} "
+    f"FROM {FTS_TABLE} JOIN tasks ON tasks.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH :query ORDER BY score LIMIT :limit"
+)
+
+_term = re.compile(r"\w+", re.UNICODE)
+
+# Окончания прилагательных, существительных и глаголов; длинные проверяются первыми
+RUSSIAN_ENDINGS = sorted(
+    (
+        "ами ями ого его ому ему ыми ими ость ости ия ие ий ию ии ая яя ое ее ые ой ей ый ую юю ом ем ам ям ах ях "
+        "ых их ым им ов ев ть ет ут ют ит ат ят а я о е ы и у ю ь"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+MIN_STEM = 4
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Create the FTS table on SQLite and fill it if it did not exist yet."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    if exists is None:
+        connection.execute(text(CREATE_FTS))
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')"))
+
+
+def rebuild_search_index(db_session: Session) -> None:
+    """Re-index every task; the caller commits."""
+    if db_session.get_bind().dialect.name == "sqlite":
+        db_session.flush()
+        db_session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')"))
+
+
+def stem(term: str) -> str:
+    for ending in RUSSIAN_ENDINGS:
+        if term.endswith(ending) and len(term) - len(ending) >= MIN_STEM:
+            return term[: -len(ending)]
+    return term
+
+
+def match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must occur, as a prefix of its stem."""
+    terms = _term.findall(query.lower())[:MAX_QUERY_TERMS]
+    return " ".join(f'"{stem(term)}"*' for term in terms)
+
+
+async def search_tasks(db: AsyncSession, query: str, limit: int) -> List[Dict[str, object]]:
+    expression = match_expression(query)
+    if not expression:
+        return []
+    rows = (await db.execute(SEARCH_QUERY, {"query": expression, "limit": limit})).mappings().all()
+    return [
+        {
+            "slug": row["slug"],
+            "title": row["task_title"],
+            "task_number": row["task_number"],
+            "score": -row["score"],
+            "snippets": {name: row[name] for name, _ in SEARCH_COLUMNS if HIGHLIGHT_OPEN in (row[name] or "")},
+        }
+        for row in rows
+    ]
@@ -0,0 +1,107 @@
+"""Bounded TTL cache of verified bearer tokens.
+
+Keys are SHA-256 digests of the raw token (the token itself is never
+stored); values hold the decoded claims and the ``UserOut`` they resolved
+to. An entry lives until the cache TTL or the token's ``exp``, whichever
+comes first. ``revoke_user`` drops every entry of a user at once; together
+with the ``token_version`` claim checked on a miss this makes logout,
+password changes and demotions take effect immediately in this process and
+within the TTL in others.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+from schemas import UserOut
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    claims: Dict[str, Any]
+    user: UserOut
+    expires_at: float
+
+
+class TokenCache:
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.revocations = 0
+
+    def get(self, digest: str) -> Optional[CachedToken]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                self._remove(digest)
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+    def put(self, digest: str, claims: Dict[str, Any], user: UserOut) -> None:
+        expires_at = time.time() + self.ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        with self._lock:
+            self._remove(digest)
+            self._entries[digest] = CachedToken(claims, user, expires_at)
+            self._by_user.setdefault(user.username, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def revoke_user(self, username: str) -> None:
+        with self._lock:
+            for digest in self._by_user.pop(username, set()):
+                self._entries.pop(digest, None)
+            self.revocations += 1
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is not None:
+            digests = self._by_user.get(entry.user.username)
+            if digests is not None:
+                digests.discard(digest)
+                if not digests:
+                    del self._by_user[entry.user.username]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "revocations": self.revocations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
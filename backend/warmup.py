@@ -0,0 +1,34 @@
+"""Background import of the heavy analytics modules.
+
+``main`` avoids importing pandas, NumPy and the seeding code at module
+level so workers start quickly; this thread loads them right after
+startup so the first data request does not pay for the imports.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, Sequence
+
+logger = logging.getLogger(__name__)
+
+timings: Dict[str, float] = {}
+
+
+def _warm_up(modules: Sequence[str]) -> None:
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            logger.exception("Warm-up import of %s failed", name)
+            continue
+        timings[name] = time.perf_counter() - started
+    logger.info("Warm-up imports done: %s", ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items()))
+
+
+def start_warmup(modules: Sequence[str]) -> threading.Thread:
+    thread = threading.Thread(target=_warm_up, args=(tuple(modules),), name="import-warmup", daemon=True)
+    thread.start()
+    return thread
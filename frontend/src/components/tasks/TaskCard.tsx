@@ -1,9 +1,18 @@
 import { useState } from "react";
+import { useQuery } from "@tanstack/react-query";
 import { ChevronDown } from "lucide-react";
 import { Link } from "react-router-dom";
 
 import { Card, CardDescription, CardTitle } from "../ui/card";
 import { Button } from "../ui/button";
+import { api } from "../../lib/api";
+
+type TaskDetails = {
+  methodology_block: string;
+  results_block: string;
+  data_block: string;
+  conclusion_block: string;
+};
 
 type TaskCardProps = {
   task: {
@@ -11,22 +20,28 @@ type TaskCardProps = {
     title: string;
     short_description: string;
     task_number: number;
-    methodology_block: string;
-    results_block: string;
-    data_block: string;
-    conclusion_block: string;
   };
+  // Slug, по которому загружаются блоки кейса (если карточка показывает другой slug)
+  detailsSlug?: string;
 };
 
-const TaskCard = ({ task }: TaskCardProps) => {
+const TaskCard = ({ task, detailsSlug = task.slug }: TaskCardProps) => {
   const [expanded, setExpanded] = useState(false);
   const [firstParagraph] = task.short_description.split("\n\n");
-  const highlights = [
-    { label: "Данные", content: task.data_block },
-    { label: "Методология", content: task.methodology_block },
-    { label: "Результаты", content: task.results_block },
-    { label: "Выводы", content: task.conclusion_block },
-  ];
+  // Список заданий содержит только краткие поля, блоки подгружаются при раскрытии карточки
+  const { data: details, isLoading: detailsLoading } = useQuery<TaskDetails>({
+    queryKey: ["task", detailsSlug],
+    queryFn: async () => (await api.get<TaskDetails>(`/tasks/${detailsSlug}`)).data,
+    enabled: expanded,
+  });
+  const highlights = details
+    ? [
+        { label: "Данные", content: details.data_block },
+        { label: "Методология", content: details.methodology_block },
+        { label: "Результаты", content: details.results_block },
+        { label: "Выводы", content: details.conclusion_block },
+      ]
+    : [];
   return (
     <Card className="flex flex-col gap-4">
       <div className="flex items-center justify-between text-sm font-semibold text-brand-600 dark:text-brand-400">
@@ -37,6 +52,7 @@ const TaskCard = ({ task }: TaskCardProps) => {
       <CardDescription>{firstParagraph}</CardDescription>
       {expanded && (
         <div className="mt-2 space-y-3 rounded-2xl bg-slate-50/70 p-4 text-sm text-slate-600 dark:bg-slate-900/60 dark:text-slate-300">
+          {detailsLoading && <p>Загружаем детали...</p>}
           {highlights.map((section) => (
             <div key={section.label}>
               <p className="text-xs font-semibold uppercase tracking-[0.3em] text-slate-400 dark:text-slate-500">{section.label}</p>
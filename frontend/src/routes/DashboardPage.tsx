@@ -6,25 +6,19 @@ import TaskCard from "../components/tasks/TaskCard";
 import { Card, CardDescription, CardTitle } from "../components/ui/card";
 import { api } from "../lib/api";
 
-type TaskOut = {
+type TaskSummary = {
   id: number;
   slug: string;
   title: string;
   short_description: string;
   task_number: number;
-  theory_block: string;
-  methodology_block: string;
-  data_block: string;
-  results_block: string;
-  conclusion_block: string;
-  links_block: string;
 };
 
 const DashboardPage = () => {
-  const { data: tasks, isLoading } = useQuery<TaskOut[]>({
+  const { data: tasks, isLoading } = useQuery<TaskSummary[]>({
     queryKey: ["tasks"],
     queryFn: async () => {
-      const response = await api.get<TaskOut[]>("/tasks");
+      const response = await api.get<TaskSummary[]>("/tasks");
       return response.data;
     },
   });
@@ -203,7 +197,7 @@ const DashboardPage = () => {
                   short_description: "Комплексный анализ проблемы транспортного коллапса мегаполиса и предложение интегрированного решения через создание единой цифровой экосистемы городской мобильности",
                   task_number: 14
                 };
-                return <TaskCard key={task.id} task={mobilityTask} />;
+                return <TaskCard key={task.id} task={mobilityTask} detailsSlug={task.slug} />;
               }
               return <TaskCard key={task.id} task={task} />;
             })}